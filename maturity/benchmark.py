@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import itertools
+import contextlib
+import subprocess
+import statistics
+from datetime import datetime, timezone
+
+import synthetic_data
+
+# --------- Config ----------
+OUTPUT_JSON = "benchmark_results.json"
+MICRO_SAMPLE = 10_000  # items per micro-benchmark run, independent of scale
+DEFAULT_SCALES = "1"  # registry multiples for stage benchmarks, e.g. "1,10,100"
+DEFAULT_REPEAT = 5
+REGRESSION_THRESHOLD = 0.10  # flag a >10% slower median in --compare
+
+
+# -----------------------------
+# Micro-benchmarks (hot functions)
+# -----------------------------
+# Each benchmark does its setup and returns (items, run); only run() is timed.
+def bench_extract_github_urls(scale, seed, workdir):
+    from fetch_biotools_IDs_and_GitHub_URLs import extract_github_urls
+
+    tools = list(itertools.islice(synthetic_data.iter_tools(1, seed), MICRO_SAMPLE))
+    return len(tools), lambda: [extract_github_urls(tool) for tool in tools]
+
+
+def bench_parse_owner_repo(scale, seed, workdir):
+    from fetch_GitHub_metrics import parse_owner_repo
+
+    rng = random.Random(seed)
+    urls = [
+        synthetic_data.make_github_url(rng, *synthetic_data.make_owner_repo(rng))
+        for _ in range(MICRO_SAMPLE)
+    ]
+    return len(urls), lambda: [parse_owner_repo(u) for u in urls]
+
+
+def bench_avg_days_to_close(scale, seed, workdir):
+    from fetch_GitHub_metrics import avg_days_to_close
+
+    # one GraphQL page (100 closed issues) per repository
+    rng = random.Random(seed)
+    pages = [synthetic_data.make_issue_nodes(rng) for _ in range(MICRO_SAMPLE // 100)]
+    return len(pages), lambda: [avg_days_to_close(nodes) for nodes in pages]
+
+
+def bench_readinto(scale, seed, workdir):
+    from fetch_biotools_IDs_and_GitHub_URLs import BiotoolsReader
+
+    tools = list(
+        itertools.islice(synthetic_data.iter_tool_bytes(1, seed), MICRO_SAMPLE)
+    )
+
+    def run():
+        reader = BiotoolsReader()
+        reader.iterator = iter(tools)  # no network: feed pre-serialized tools
+        buf = bytearray(io.DEFAULT_BUFFER_SIZE)
+        while reader.readinto(buf):
+            pass
+
+    return len(tools), run
+
+
+def bench_repo_key(scale, seed, workdir):
+    from repo_overlap import repo_key
+
+    rng = random.Random(seed)
+    urls = [
+        synthetic_data.make_github_url(rng, *synthetic_data.make_owner_repo(rng))
+        for _ in range(MICRO_SAMPLE)
+    ]
+    return len(urls), lambda: [repo_key(u) for u in urls]
+
+
+def bench_dump_get(scale, seed, workdir):
+    from registry_dump import DumpReader
+
+    reader = DumpReader(_tools_dump(1, seed, workdir))
+    rng = random.Random(seed)
+    ids = rng.sample(sorted(reader.ids), min(100, len(reader.ids)))
+    return len(ids), lambda: [reader.get(i) for i in ids]
+
+
+# -----------------------------
+# Stage benchmarks (end to end, scaled)
+# -----------------------------
+def _tools_jsonl(scale, seed, workdir) -> str:
+    """Materialize synthetic tools once per scale so generation is not timed."""
+    path = os.path.join(workdir, f"tools-x{scale}-s{seed}.jsonl")
+    if not os.path.exists(path):
+        with open(path, "wb") as f:
+            for tool in synthetic_data.iter_tool_bytes(scale, seed):
+                f.write(tool + b"\n")
+    return path
+
+
+def _tools_dump(scale, seed, workdir) -> str:
+    from registry_dump import DumpWriter, index_path
+
+    path = os.path.join(workdir, f"tools-x{scale}-s{seed}.jsonl.gz")
+    if not os.path.exists(index_path(path)):
+        with DumpWriter(path) as w:
+            for tool in synthetic_data.iter_tools(scale, seed):
+                w.write(json.dumps(tool).encode("utf-8"), tool["biotoolsID"])
+    return path
+
+
+def _metrics_csv(scale, seed, workdir) -> str:
+    path = os.path.join(workdir, f"metrics-x{scale}-s{seed}.csv")
+    if not os.path.exists(path):
+        synthetic_data.write_metrics_csv(path, scale, seed)
+    return path
+
+
+def _count_lines(path: str) -> int:
+    with open(path, "rb") as f:
+        return sum(1 for _ in f)
+
+
+def bench_stage_map(scale, seed, workdir):
+    from fetch_biotools_IDs_and_GitHub_URLs import write_outputs
+
+    src = _tools_jsonl(scale, seed, workdir)
+
+    def run():
+        with open(src, "rb") as f:
+            write_outputs(
+                (line.rstrip(b"\n") for line in f),
+                os.path.join(workdir, "backup.jsonl.gz"),
+                os.path.join(workdir, "biotools_github_map.csv"),
+            )
+
+    return _count_lines(src), run
+
+
+def bench_stage_dump_scan(scale, seed, workdir):
+    from registry_dump import DumpReader
+
+    src = _tools_dump(scale, seed, workdir)
+    reader = DumpReader(src)
+    return len(reader), lambda: sum(1 for _ in reader.iter_tools())
+
+
+def bench_stage_counts(scale, seed, workdir):
+    import calculate_statistics as cs
+
+    src = _metrics_csv(scale, seed, workdir)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            cs.print_counts(cs.load_table(cs.STAGE_COLUMNS["counts"], src))
+
+    return _count_lines(src) - 1, run
+
+
+def bench_stage_classify(scale, seed, workdir):
+    import calculate_statistics as cs
+
+    src = _metrics_csv(scale, seed, workdir)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            cs.run_classification(cs.load_table(cs.STAGE_COLUMNS["classify"], src))
+
+    return _count_lines(src) - 1, run
+
+
+def bench_stage_pca(scale, seed, workdir):
+    import calculate_statistics as cs
+
+    src = _metrics_csv(scale, seed, workdir)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            cs.run_pca(
+                cs.load_table(cs.STAGE_COLUMNS["pca"], src),
+                figure=os.path.join(workdir, "PCA.svg"),
+            )
+
+    return _count_lines(src) - 1, run
+
+
+BENCHMARKS = {
+    "micro.extract_github_urls": bench_extract_github_urls,
+    "micro.parse_owner_repo": bench_parse_owner_repo,
+    "micro.avg_days_to_close": bench_avg_days_to_close,
+    "micro.BiotoolsReader.readinto": bench_readinto,
+    "micro.repo_key": bench_repo_key,
+    "micro.DumpReader.get": bench_dump_get,
+    "stage.map": bench_stage_map,
+    "stage.dump_scan": bench_stage_dump_scan,
+    "stage.counts": bench_stage_counts,
+    "stage.classify": bench_stage_classify,
+    "stage.pca": bench_stage_pca,
+}
+
+
+# -----------------------------
+# Runner
+# -----------------------------
+def run_benchmark(name, scale, seed, repeat, workdir) -> dict:
+    items, run = BENCHMARKS[name](scale, seed, workdir)
+    run()  # warm-up: imports, caches, first-touch of the input files
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - t0)
+    median = statistics.median(times)
+    return {
+        "name": name,
+        "scale": scale,
+        "items": items,
+        "repeat": repeat,
+        "best_s": min(times),
+        "median_s": median,
+        "per_item_us": median / items * 1e6 if items else None,
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict, threshold=REGRESSION_THRESHOLD) -> int:
+    """Print median ratios against a baseline file; return the number of regressions."""
+    old = {(r["name"], r["scale"]): r for r in baseline["results"]}
+    regressions = 0
+    print(f"\nCompared with {baseline['meta'].get('git_revision')} (median, new/old):")
+    for r in current["results"]:
+        b = old.get((r["name"], r["scale"]))
+        if b is None:
+            continue
+        ratio = r["median_s"] / b["median_s"] if b["median_s"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"  {r['name']:<34} x{r['scale']:<5} {ratio:6.2f}{flag}")
+    return regressions
+
+
+# --------- Main ----------
+def main():
+    ap = argparse.ArgumentParser(
+        description="Micro and stage benchmarks on seeded synthetic registry data."
+    )
+    ap.add_argument("--only", help="comma-separated benchmark names or prefixes")
+    ap.add_argument("--scales", default=DEFAULT_SCALES, help="e.g. 1,10,100")
+    ap.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workdir", help="keep generated inputs here between runs")
+    ap.add_argument("--output", default=OUTPUT_JSON)
+    ap.add_argument("--compare", help="earlier results JSON to compare against")
+    ap.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = ap.parse_args()
+
+    names = list(BENCHMARKS)
+    if args.only:
+        prefixes = [p.strip() for p in args.only.split(",") if p.strip()]
+        names = [n for n in names if any(n.startswith(p) for p in prefixes)]
+    scales = [float(s) if "." in s else int(s) for s in args.scales.split(",")]
+    empty = [s for s in scales if int(synthetic_data.REGISTRY_SIZE * s) < 1]
+    if empty:
+        ap.error(f"--scales {','.join(map(str, empty))}: no synthetic tools at that scale")
+
+    results = {
+        "meta": {
+            "git_revision": _git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "micro_sample": MICRO_SAMPLE,
+        },
+        "results": [],
+    }
+
+    with contextlib.ExitStack() as stack:
+        workdir = args.workdir or stack.enter_context(tempfile.TemporaryDirectory())
+        os.makedirs(workdir, exist_ok=True)
+        for name in names:
+            # micro-benchmarks use a fixed sample, so they only run once
+            for scale in [1] if name.startswith("micro.") else scales:
+                r = run_benchmark(name, scale, args.seed, args.repeat, workdir)
+                results["results"].append(r)
+                per_item = r["per_item_us"]
+                print(
+                    f"{name:<34} x{scale:<5} {r['items']:>10,} items  "
+                    f"median {r['median_s']:9.4f}s  "
+                    + (f"{per_item:10.2f} µs/item" if per_item is not None else f"{'-':>10} µs/item")
+                )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            if compare(results, json.load(f), args.threshold):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,15 @@
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
+#!/usr/bin/env python3
+import math
+import argparse
 
-from matplotlib.patches import Ellipse
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report, confusion_matrix
-from sklearn.model_selection import train_test_split
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
+# pandas, matplotlib and scikit-learn are imported inside the stages that use
+# them, so e.g. a "counts" run does not pay for loading the plotting/ML stack.
 
 # =========================
 # Config
 # =========================
 CSV_FILE = "biotools_with_metrics_and_maturity.csv"
+MAP_CSV = "biotools_github_map.csv"
 PCA_FIGURE = "PCA.svg"
 
 PLOT_NONE = False  # whether to plot "None" maturity (should be False for your case)
@@ -21,6 +18,15 @@ ELLIPSE_95K = 2.4477  # sqrt(chi2.ppf(0.95, df=2))
 ELLIPSE_LW = 2
 ELLIPSE_ALPHA = 0.9
 
+# "scatter" draws one vector marker per tool; "density" bins each maturity level
+# into a rasterized 2D histogram so the SVG size does not grow with the data
+PCA_RENDER = "density"
+PCA_XLIM = (-3, 15)
+PCA_YLIM = (-4, 4)
+DENSITY_BINS = 200
+DENSITY_ALPHA = 0.6
+DENSITY_DPI = 200
+
 NUMERIC_COLS = [
     "repo.stargazers_count",
     "repo.watchers_count",
@@ -43,6 +49,16 @@ MATURITY_CANONICAL = {
 
 MATURITY_ORDER = ["Emerging", "Mature", "Legacy"]  # fixed display order
 
+STAGES = ["counts", "classify", "pca", "venn"]
+
+# columns each stage reads from CSV_FILE; anything else is never parsed
+STAGE_COLUMNS = {
+    "counts": ["repo_url", *NUMERIC_COLS],
+    "classify": ["repo_url", "maturity", *NUMERIC_COLS],
+    "pca": ["maturity", *NUMERIC_COLS],
+    "venn": ["repo_url", *NUMERIC_COLS],
+}
+
 
 # =========================
 # Helper: covariance ellipse
@@ -57,6 +73,9 @@ def add_cov_ellipse(
     alpha=ELLIPSE_ALPHA,
 ):
     """Add a covariance ellipse for points (x, y) onto ax."""
+    import numpy as np
+    from matplotlib.patches import Ellipse
+
     if len(x) < 2:
         return
     xy = np.column_stack([x, y])
@@ -85,209 +104,318 @@ def add_cov_ellipse(
 
 
 # =========================
-# 1) Load & normalize
+# Helper: density layer
 # =========================
-df = pd.read_csv(CSV_FILE, dtype=str).fillna("")
-
-# Normalize maturity field early, once
-df["maturity"] = df.get("maturity", np.nan).astype(str).str.strip().str.lower()
+def add_density_layer(
+    ax,
+    x,
+    y,
+    color,
+    xlim=PCA_XLIM,
+    ylim=PCA_YLIM,
+    bins=DENSITY_BINS,
+    alpha=DENSITY_ALPHA,
+):
+    """Bin points (x, y) into a 2D histogram and draw it onto ax as a rasterized layer."""
+    import numpy as np
+    from matplotlib.colors import to_rgb
 
-df["maturity"] = df["maturity"].replace({"": "none", "na": "none", "nan": "none"})
-df["maturity"] = df["maturity"].map(MATURITY_CANONICAL).fillna("None")
+    counts, _, _ = np.histogram2d(x, y, bins=bins, range=[xlim, ylim])
+    if not counts.any():
+        return
 
-# Normalize biotoolsID
-df["biotoolsID"] = df.get("biotoolsID", np.nan).fillna("unknown")
+    # log-scaled opacity keeps sparse outliers visible next to the dense core
+    weight = np.log1p(counts.T) / np.log1p(counts.max())
+    rgba = np.zeros(weight.shape + (4,))
+    rgba[..., :3] = to_rgb(color)
+    rgba[..., 3] = weight * alpha
+
+    ax.imshow(
+        rgba,
+        extent=(*xlim, *ylim),
+        origin="lower",
+        interpolation="nearest",
+        aspect="auto",
+        rasterized=True,
+    )
 
-# Convert numeric columns
-for c in NUMERIC_COLS:
-    df[c] = pd.to_numeric(df[c], errors="coerce")
 
 # =========================
-# 2) Basic counts (GitHub / metrics)
+# 1) Load & normalize
 # =========================
-with_github = df[df["repo_url"].str.contains("github.com", case=False, na=False)]
-n_with_github = len(with_github)
+def load_table(columns: list[str], csv_file: str = CSV_FILE, db=None):
+    """
+    Read only `columns` from csv_file (or the metrics + maturity view of the
+    SQLite store `db`) with their final dtypes, and add the derived boolean
+    columns `is_github` and `has_metrics`.
+    """
+    import numpy as np
+    import pandas as pd
+
+    wanted = set(columns)
+    dtype = {c: "float64" for c in NUMERIC_COLS}
+    dtype.update({"repo_url": "string", "maturity": "category"})
+
+    if db:
+        import sqlite3
+
+        conn = sqlite3.connect(f"file:{db}?mode=ro", uri=True)
+        try:
+            view = "biotools_with_metrics_and_maturity"
+            names = [d[0] for d in conn.execute(f"SELECT * FROM {view} LIMIT 0").description]
+            cols = ", ".join(f'"{c}"' for c in names if c in wanted)
+            df = pd.read_sql_query(f"SELECT {cols} FROM {view}", conn)
+        finally:
+            conn.close()
+        df = df.astype({c: d for c, d in dtype.items() if c in df})
+    else:
+        df = pd.read_csv(
+            csv_file,
+            usecols=lambda c: c in wanted,
+            dtype={c: d for c, d in dtype.items() if c in wanted},
+        )
 
-valid_mask = df[NUMERIC_COLS].notna().any(axis=1)
-valid_repos = df[
-    valid_mask & df["repo_url"].str.contains("github.com", case=False, na=False)
-]
-n_valid = len(valid_repos)
+    # Normalize maturity once, on the (few) categories rather than every row
+    if "maturity" in wanted:
+        levels = [*MATURITY_ORDER, "None"]
+        raw = df["maturity"] if "maturity" in df else pd.Series(index=df.index)
+        raw = raw.astype("category")
+        canon = np.array(
+            [
+                levels.index(MATURITY_CANONICAL.get(str(c).strip().lower(), "None"))
+                for c in raw.cat.categories
+            ]
+            + [levels.index("None")],  # code -1 (missing) indexes this last slot
+            dtype="int8",
+        )
+        df["maturity"] = pd.Categorical.from_codes(
+            canon[raw.cat.codes.to_numpy()], categories=levels
+        )
+
+    # GitHub mask and metrics mask, computed once and shared by all stages
+    if "repo_url" in wanted:
+        is_github = df["repo_url"].str.contains("github.com", case=False, regex=False)
+        df["is_github"] = is_github.fillna(False).astype(bool)
+    present = [c for c in NUMERIC_COLS if c in df]
+    if present:
+        df["has_metrics"] = df[present].notna().any(axis=1)
+
+    return df
 
-print(f"bio.tools entries total:                     {len(df):,}")
-print(f"Entries with any GitHub URL:                 {n_with_github:,}")
-print(f"Entries with valid GitHub repo metrics:      {n_valid:,}")
-if n_with_github:
-    print(
-        f"→ Fraction of valid among GitHub entries:    {n_valid / n_with_github * 100:.1f}%"
-    )
 
 # =========================
-# 3) Classification: predict maturity from metrics
+# 2) Basic counts (GitHub / metrics)
 # =========================
-# Restrict to Emerging / Mature / Legacy with valid metrics + GitHub
-
-df_clf = df[
-    df["maturity"].isin(MATURITY_ORDER)
-    & df["repo_url"].str.contains("github.com", case=False, na=False)
-    & valid_mask
-].copy()
-
-print("\nDataset sizes:")
-print("Rows total:", len(df))
-print(
-    "Rows after filtering (Emerging/Mature/Legacy + GitHub + valid metrics):",
-    len(df_clf),
-)
-print(df_clf["maturity"].value_counts())
-
-print("\nClass distribution (for modeling):")
-class_counts = df_clf["maturity"].value_counts().reindex(MATURITY_ORDER)
-print(class_counts)
-
-X = df_clf[NUMERIC_COLS].fillna(0.0)
-y = df_clf["maturity"]
-
-X_train, X_test, y_train, y_test = train_test_split(
-    X,
-    y,
-    test_size=0.2,
-    stratify=y,
-    random_state=42,
-)
-
-clf = RandomForestClassifier(
-    n_estimators=300,
-    max_depth=None,
-    class_weight="balanced",
-    random_state=42,
-)
-clf.fit(X_train, y_train)
-
-y_pred = clf.predict(X_test)
-
-print("\nClassification report:")
-print(classification_report(y_test, y_pred, labels=MATURITY_ORDER))
-
-# -------------------------
-# Labeled confusion matrix
-# -------------------------
-labels_present = [l for l in MATURITY_ORDER if l in y_test.unique()]
-cm_present = confusion_matrix(y_test, y_pred, labels=labels_present)
-
-# build full 3×3 (Emerging/Mature/Legacy), zero where missing
-cm_full = np.zeros((len(MATURITY_ORDER), len(MATURITY_ORDER)), dtype=int)
-for i_t, t_lab in enumerate(labels_present):
-    for i_p, p_lab in enumerate(labels_present):
-        cm_full[MATURITY_ORDER.index(t_lab), MATURITY_ORDER.index(p_lab)] = cm_present[
-            i_t, i_p
-        ]
-
-cm_df = pd.DataFrame(
-    cm_full,
-    index=[f"True {l}" for l in MATURITY_ORDER],
-    columns=[f"Pred {l}" for l in MATURITY_ORDER],
-)
-
-print("\nConfusion matrix (counts):")
-print(cm_df)
-
-# -------------------------
-# Feature importances
-# -------------------------
-imp = pd.Series(clf.feature_importances_, index=NUMERIC_COLS)
-print("\nFeature importances (RandomForest):")
-print(imp.sort_values(ascending=False))
+def print_counts(df) -> dict:
+    n_with_github = int(df["is_github"].sum())
+    n_valid = int((df["is_github"] & df["has_metrics"]).sum())
+
+    print(f"bio.tools entries total:                     {len(df):,}")
+    print(f"Entries with any GitHub URL:                 {n_with_github:,}")
+    print(f"Entries with valid GitHub repo metrics:      {n_valid:,}")
+    if n_with_github:
+        print(
+            f"→ Fraction of valid among GitHub entries:    {n_valid / n_with_github * 100:.1f}%"
+        )
+    return {"total": len(df), "with_github": n_with_github, "valid": n_valid}
 
 
 # =========================
-# 4) PCA on metrics, colored by maturity
+# 3) Classification: predict maturity from metrics
 # =========================
-df_pca = df[df["maturity"].isin(MATURITY_ORDER)].copy()
-X_pca_input = df_pca[NUMERIC_COLS].fillna(0.0).values
-X_pca_input = np.log1p(X_pca_input)  # shrink heavy tails
-X_scaled = StandardScaler().fit_transform(X_pca_input)
-
-pca = PCA(n_components=2)
-X_pca = pca.fit_transform(X_scaled)
+def run_classification(df):
+    import numpy as np
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import classification_report, confusion_matrix
+    from sklearn.model_selection import train_test_split
+
+    # Restrict to Emerging / Mature / Legacy with valid metrics + GitHub
+    df_clf = df[
+        df["maturity"].isin(MATURITY_ORDER) & df["is_github"] & df["has_metrics"]
+    ].copy()
+    df_clf["maturity"] = df_clf["maturity"].cat.remove_unused_categories()
+
+    print("\nDataset sizes:")
+    print("Rows total:", len(df))
+    print(
+        "Rows after filtering (Emerging/Mature/Legacy + GitHub + valid metrics):",
+        len(df_clf),
+    )
+    print(df_clf["maturity"].value_counts())
 
-df_pca["PC1"] = X_pca[:, 0]
-df_pca["PC2"] = X_pca[:, 1]
+    print("\nClass distribution (for modeling):")
+    class_counts = df_clf["maturity"].value_counts().reindex(MATURITY_ORDER)
+    print(class_counts)
 
-print("\nPCA explained variance ratio (PC1, PC2):")
-print(pca.explained_variance_ratio_)
+    X = df_clf[NUMERIC_COLS].fillna(0.0)
+    y = df_clf["maturity"].astype(str)
 
-fig, ax = plt.subplots(figsize=(8, 8))
+    X_train, X_test, y_train, y_test = train_test_split(
+        X,
+        y,
+        test_size=0.2,
+        stratify=y,
+        random_state=42,
+    )
 
-maturity_colors = {
-    "Emerging": "green",
-    "Legacy": "red",
-    "Mature": "blue",
-}
-default_color = "gray"
-
-all_levels = df_pca["maturity"].unique().tolist()
-if not PLOT_NONE:
-    all_levels = [m for m in all_levels if m != "None"]
-
-legend_order = [m for m in MATURITY_ORDER if m in all_levels]
-if "None" in all_levels and PLOT_NONE:
-    legend_order.append("None")
-
-for level in legend_order:
-    subset = df_pca[df_pca["maturity"] == level]
-    ax.scatter(
-        subset["PC1"],
-        subset["PC2"],
-        label=level,
-        s=POINT_SIZE,
-        alpha=0.3,
-        color=maturity_colors.get(level, default_color),
+    clf = RandomForestClassifier(
+        n_estimators=300,
+        max_depth=None,
+        class_weight="balanced",
+        random_state=42,
     )
-    if len(subset) >= 3:
-        add_cov_ellipse(
-            ax,
-            subset["PC1"].to_numpy(dtype=float),
-            subset["PC2"].to_numpy(dtype=float),
-            edgecolor=maturity_colors.get(level, default_color),
-        )
+    clf.fit(X_train, y_train)
+
+    y_pred = clf.predict(X_test)
+
+    print("\nClassification report:")
+    print(classification_report(y_test, y_pred, labels=MATURITY_ORDER))
+
+    # -------------------------
+    # Labeled confusion matrix
+    # -------------------------
+    labels_present = [l for l in MATURITY_ORDER if l in y_test.unique()]
+    cm_present = confusion_matrix(y_test, y_pred, labels=labels_present)
+
+    # build full 3×3 (Emerging/Mature/Legacy), zero where missing
+    cm_full = np.zeros((len(MATURITY_ORDER), len(MATURITY_ORDER)), dtype=int)
+    for i_t, t_lab in enumerate(labels_present):
+        for i_p, p_lab in enumerate(labels_present):
+            cm_full[MATURITY_ORDER.index(t_lab), MATURITY_ORDER.index(p_lab)] = (
+                cm_present[i_t, i_p]
+            )
+
+    cm_df = pd.DataFrame(
+        cm_full,
+        index=[f"True {l}" for l in MATURITY_ORDER],
+        columns=[f"Pred {l}" for l in MATURITY_ORDER],
+    )
+
+    print("\nConfusion matrix (counts):")
+    print(cm_df)
 
-ax.autoscale(enable=True, tight=True)
-ax.set_xlabel(f"PC1 ({pca.explained_variance_ratio_[0] * 100:.1f}% var)")
-ax.set_ylabel(f"PC2 ({pca.explained_variance_ratio_[1] * 100:.1f}% var)")
-ax.set_title("PCA of GitHub repository maturity-related metrics by bio.tools maturity")
-ax.legend(title="Maturity level", loc="best", frameon=False)
-ax.grid(True, linestyle="--", alpha=0.3)
-ax.set_xlim(-3, 15)
-ax.set_ylim(-4, 4)
+    # -------------------------
+    # Feature importances
+    # -------------------------
+    imp = pd.Series(clf.feature_importances_, index=NUMERIC_COLS)
+    print("\nFeature importances (RandomForest):")
+    print(imp.sort_values(ascending=False))
 
-plt.savefig(PCA_FIGURE, format="svg", bbox_inches="tight")
-plt.close(fig)
 
 # =========================
-# PCA loadings (PC1 and PC2)
+# 4) PCA on metrics, colored by maturity
 # =========================
-loadings = pd.DataFrame(
-    pca.components_.T, index=NUMERIC_COLS, columns=["PC1_loading", "PC2_loading"]
-)
+def run_pca(df, figure: str = PCA_FIGURE, render: str = PCA_RENDER):
+    import numpy as np
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import Patch
+    from sklearn.decomposition import PCA
+    from sklearn.preprocessing import StandardScaler
+
+    df_pca = df[df["maturity"].isin(MATURITY_ORDER)].copy()
+    X_pca_input = df_pca[NUMERIC_COLS].fillna(0.0).values
+    X_pca_input = np.log1p(X_pca_input)  # shrink heavy tails
+    X_scaled = StandardScaler().fit_transform(X_pca_input)
+
+    pca = PCA(n_components=2)
+    X_pca = pca.fit_transform(X_scaled)
+
+    df_pca["PC1"] = X_pca[:, 0]
+    df_pca["PC2"] = X_pca[:, 1]
+
+    print("\nPCA explained variance ratio (PC1, PC2):")
+    print(pca.explained_variance_ratio_)
+
+    fig, ax = plt.subplots(figsize=(8, 8))
+
+    maturity_colors = {
+        "Emerging": "green",
+        "Legacy": "red",
+        "Mature": "blue",
+    }
+    default_color = "gray"
+
+    all_levels = df_pca["maturity"].unique().tolist()
+    if not PLOT_NONE:
+        all_levels = [m for m in all_levels if m != "None"]
+
+    legend_order = [m for m in MATURITY_ORDER if m in all_levels]
+    if "None" in all_levels and PLOT_NONE:
+        legend_order.append("None")
+
+    legend_handles = []
+    for level in legend_order:
+        subset = df_pca[df_pca["maturity"] == level]
+        if render == "density":
+            add_density_layer(
+                ax,
+                subset["PC1"].to_numpy(dtype=float),
+                subset["PC2"].to_numpy(dtype=float),
+                color=maturity_colors.get(level, default_color),
+            )
+            legend_handles.append(
+                Patch(
+                    color=maturity_colors.get(level, default_color),
+                    alpha=DENSITY_ALPHA,
+                    label=level,
+                )
+            )
+        else:
+            legend_handles.append(
+                ax.scatter(
+                    subset["PC1"],
+                    subset["PC2"],
+                    label=level,
+                    s=POINT_SIZE,
+                    alpha=0.3,
+                    color=maturity_colors.get(level, default_color),
+                )
+            )
+        if len(subset) >= 3:
+            add_cov_ellipse(
+                ax,
+                subset["PC1"].to_numpy(dtype=float),
+                subset["PC2"].to_numpy(dtype=float),
+                edgecolor=maturity_colors.get(level, default_color),
+            )
+
+    ax.autoscale(enable=True, tight=True)
+    ax.set_xlabel(f"PC1 ({pca.explained_variance_ratio_[0] * 100:.1f}% var)")
+    ax.set_ylabel(f"PC2 ({pca.explained_variance_ratio_[1] * 100:.1f}% var)")
+    ax.set_title(
+        "PCA of GitHub repository maturity-related metrics by bio.tools maturity"
+    )
+    ax.legend(handles=legend_handles, title="Maturity level", loc="best", frameon=False)
+    ax.grid(True, linestyle="--", alpha=0.3)
+    ax.set_xlim(*PCA_XLIM)
+    ax.set_ylim(*PCA_YLIM)
+
+    # only the density layers are rasterized; dpi sets their embedded resolution
+    plt.savefig(figure, format="svg", bbox_inches="tight", dpi=DENSITY_DPI)
+    plt.close(fig)
+
+    # =========================
+    # PCA loadings (PC1 and PC2)
+    # =========================
+    loadings = pd.DataFrame(
+        pca.components_.T, index=NUMERIC_COLS, columns=["PC1_loading", "PC2_loading"]
+    )
+
+    print("\nPCA loadings (PC1, PC2):")
+    print(loadings)
 
-print("\nPCA loadings (PC1, PC2):")
-print(loadings)
 
 # =========================
 # 6) Area-proportional Venn diagram (GitHub vs bio.tools)
 #     - true area proportions
 #     - GitHub circle mostly off-frame (only a small arc visible)
 # =========================
-import math
-from matplotlib.patches import Circle
-
 VENN_FIGURE = "venn_github_biotools_truncated.svg"
 
-# True counts
+# Public GitHub repositories (Octoverse 2025); used when no listing is given
 GITHUB_TOTAL = 395_000_000
-BIOTOOLS_TOTAL = 30_608
-OVERLAP_TOTAL = 13_391
 
 
 def circle_intersection_area(r1: float, r2: float, d: float) -> float:
@@ -329,100 +457,187 @@ def find_distance_for_intersection(r1: float, r2: float, target_area: float) ->
     return 0.5 * (lo + hi)
 
 
-# -------------------------------------------------
-# 1) Radii in "size units": area = count
-#    => pi * r^2 = count => r = sqrt(count / pi)
-# -------------------------------------------------
-rG0 = math.sqrt(GITHUB_TOTAL / math.pi)
-rB0 = math.sqrt(BIOTOOLS_TOTAL / math.pi)
-
-# Distance between centers so that intersection area = OVERLAP_TOTAL
-d0 = find_distance_for_intersection(rG0, rB0, OVERLAP_TOTAL)
-
-# -------------------------------------------------
-# 2) Rescale so that bio.tools circle has a convenient radius (e.g. 1)
-#    Geometry (relative sizes, overlap) is preserved under uniform scaling.
-# -------------------------------------------------
-desired_rB = 1.0
-scale = desired_rB / rB0
-
-r_biotools = rB0 * scale
-r_github = rG0 * scale
-d = d0 * scale
-
-# Place bio.tools at origin, GitHub far to the left at (-d, 0)
-biotools_center = (0.0, 0.0)
-github_center = (0.0, -d)
-
-fig, ax = plt.subplots(figsize=(8, 8))  # same proportions as PCA
-
-github_circle = Circle(
-    github_center,
-    r_github,
-    facecolor="#181717",
-    edgecolor="#0E0E0E",
-    alpha=0.5,
-    linewidth=1.5 * 0,
-)
-biotools_circle = Circle(
-    biotools_center,
-    r_biotools,
-    facecolor="#005472",  # bio.tools blue
-    edgecolor="#003346",
-    alpha=0.7,
-    linewidth=1.5 * 0,
-)
-
-ax.add_patch(github_circle)
-ax.add_patch(biotools_circle)
-
-# -------------------------------------------------
-# 3) Crop view so that:
-#    - full bio.tools circle is visible
-#    - overlap region is visible
-#    - only a small arc of the huge GitHub circle is shown
-# -------------------------------------------------
-margin = 3.0 * r_biotools
-ax.set_xlim(-4 * r_biotools, 4 * r_biotools)
-ax.set_ylim(-6 * r_biotools, 2 * r_biotools)
-ax.set_aspect("equal", adjustable="box")
-ax.axis("off")
-
-# Text labels
-# ax.text(
-#    biotools_center[0],
-#    biotools_center[1],
-#    f"bio.tools\n{BIOTOOLS_TOTAL:,} tools",
-#    ha="center",
-#    va="center",
-#    fontsize=10,
-#    color="black",
-# )
-
-# ax.text(
-#    -2.5 * r_biotools,
-#    3.2 * r_biotools,
-#    f"GitHub\n{GITHUB_TOTAL:,} repositories\n(circle mostly off-frame)",
-#    ha="right",
-#    va="top",
-#    fontsize=9,
-# )
-
-# ax.text(
-#    0.0,
-#    -2.5 * r_biotools,
-#    f"Overlap\n{OVERLAP_TOTAL:,} repositories",
-#    ha="center",
-#    va="top",
-#    fontsize=9,
-#    fontweight="bold",
-# )
-
-# ax.set_title(
-#    "Area-proportional Venn diagram (truncated view)\n"
-#    "GitHub vs bio.tools repositories",
-#    fontsize=12,
-# )
-
-plt.savefig(VENN_FIGURE, format="svg", bbox_inches="tight")
-plt.close(fig)
+def venn_counts(df, github_listing=None, map_csv: str = MAP_CSV):
+    """
+    (GitHub repositories, bio.tools entries, entries with a GitHub repository).
+
+    Without a listing the overlap is the entries that resolved to a valid
+    public repository. With a listing (one owner/repo or URL per line,
+    optionally gzipped) it is spilled to disk once, together with the map
+    CSV's keys, giving the listing's distinct repositories and the ones the
+    registry shares with it in the same pass.
+    """
+    if github_listing is None:
+        n_valid = int((df["is_github"] & df["has_metrics"]).sum())
+        return GITHUB_TOTAL, len(df), n_valid
+
+    from repo_overlap import count_regions, iter_listing, iter_map_keys
+
+    tools = list(iter_map_keys(map_csv))
+    hits: set[str] = set()
+
+    def keep_shared(key, members):
+        if len(members) == 2:
+            hits.add(key)
+
+    regions = count_regions(
+        {"github": iter_listing(github_listing), "bio.tools": (k for _, k in tools if k)},
+        on_key=keep_shared,
+    )
+    github_total = sum(n for members, n in regions.items() if "github" in members)
+    overlap_total = sum(1 for _, k in tools if k in hits)
+    return github_total, len(tools), overlap_total
+
+
+def plot_venn(
+    github_total: int,
+    biotools_total: int,
+    overlap_total: int,
+    figure: str = VENN_FIGURE,
+):
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import Circle
+
+    # -------------------------------------------------
+    # 1) Radii in "size units": area = count
+    #    => pi * r^2 = count => r = sqrt(count / pi)
+    # -------------------------------------------------
+    rG0 = math.sqrt(github_total / math.pi)
+    rB0 = math.sqrt(biotools_total / math.pi)
+
+    # Distance between centers so that intersection area = overlap_total
+    d0 = find_distance_for_intersection(rG0, rB0, overlap_total)
+
+    # -------------------------------------------------
+    # 2) Rescale so that bio.tools circle has a convenient radius (e.g. 1)
+    #    Geometry (relative sizes, overlap) is preserved under uniform scaling.
+    # -------------------------------------------------
+    desired_rB = 1.0
+    scale = desired_rB / rB0
+
+    r_biotools = rB0 * scale
+    r_github = rG0 * scale
+    d = d0 * scale
+
+    # Place bio.tools at origin, GitHub far to the left at (-d, 0)
+    biotools_center = (0.0, 0.0)
+    github_center = (0.0, -d)
+
+    fig, ax = plt.subplots(figsize=(8, 8))  # same proportions as PCA
+
+    github_circle = Circle(
+        github_center,
+        r_github,
+        facecolor="#181717",
+        edgecolor="#0E0E0E",
+        alpha=0.5,
+        linewidth=1.5 * 0,
+    )
+    biotools_circle = Circle(
+        biotools_center,
+        r_biotools,
+        facecolor="#005472",  # bio.tools blue
+        edgecolor="#003346",
+        alpha=0.7,
+        linewidth=1.5 * 0,
+    )
+
+    ax.add_patch(github_circle)
+    ax.add_patch(biotools_circle)
+
+    # -------------------------------------------------
+    # 3) Crop view so that:
+    #    - full bio.tools circle is visible
+    #    - overlap region is visible
+    #    - only a small arc of the huge GitHub circle is shown
+    # -------------------------------------------------
+    ax.set_xlim(-4 * r_biotools, 4 * r_biotools)
+    ax.set_ylim(-6 * r_biotools, 2 * r_biotools)
+    ax.set_aspect("equal", adjustable="box")
+    ax.axis("off")
+
+    # Text labels
+    # ax.text(
+    #    biotools_center[0],
+    #    biotools_center[1],
+    #    f"bio.tools\n{biotools_total:,} tools",
+    #    ha="center",
+    #    va="center",
+    #    fontsize=10,
+    #    color="black",
+    # )
+
+    # ax.text(
+    #    -2.5 * r_biotools,
+    #    3.2 * r_biotools,
+    #    f"GitHub\n{github_total:,} repositories\n(circle mostly off-frame)",
+    #    ha="right",
+    #    va="top",
+    #    fontsize=9,
+    # )
+
+    # ax.text(
+    #    0.0,
+    #    -2.5 * r_biotools,
+    #    f"Overlap\n{overlap_total:,} repositories",
+    #    ha="center",
+    #    va="top",
+    #    fontsize=9,
+    #    fontweight="bold",
+    # )
+
+    # ax.set_title(
+    #    "Area-proportional Venn diagram (truncated view)\n"
+    #    "GitHub vs bio.tools repositories",
+    #    fontsize=12,
+    # )
+
+    plt.savefig(figure, format="svg", bbox_inches="tight")
+    plt.close(fig)
+
+
+# --------- Main pipeline ----------
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Summary counts, maturity classification, PCA and Venn figures."
+    )
+    ap.add_argument(
+        "--stages",
+        default=",".join(STAGES),
+        help=f"comma-separated subset of {','.join(STAGES)} (default: all)",
+    )
+    ap.add_argument("--csv", default=CSV_FILE, help="metrics + maturity CSV")
+    ap.add_argument("--db", help="read the metrics + maturity view of this store instead of --csv")
+    ap.add_argument("--render", choices=["density", "scatter"], default=PCA_RENDER)
+    ap.add_argument("--map-csv", default=MAP_CSV, help="bio.tools → GitHub map CSV")
+    ap.add_argument(
+        "--github-listing",
+        help="file of GitHub owner/repo names (.gz ok) to compute the Venn overlap from",
+    )
+    args = ap.parse_args(argv)
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        ap.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    columns = sorted({c for s in stages for c in STAGE_COLUMNS[s]})
+    df = load_table(columns, args.csv, args.db) if columns else None
+
+    if "counts" in stages:
+        print_counts(df)
+    if "classify" in stages:
+        run_classification(df)
+    if "pca" in stages:
+        run_pca(df, render=args.render)
+    if "venn" in stages:
+        github_total, biotools_total, overlap_total = venn_counts(
+            df, args.github_listing, args.map_csv
+        )
+        print(f"\nVenn: GitHub {github_total:,}, bio.tools {biotools_total:,}, "
+              f"overlap {overlap_total:,}")
+        plot_venn(github_total, biotools_total, overlap_total)
+
+
+if __name__ == "__main__":
+    main()
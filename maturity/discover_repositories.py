@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+import csv
+import sys
+import math
+import argparse
+import typing as t
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+import fetch_GitHub_metrics as fg
+from repo_cache import CACHE_JSON, RepoCache
+from repo_overlap import RepoIndex, repo_key
+
+# --------- Input/Output ----------
+OUTPUT_CSV = "github_candidates.csv"  # map-format: fetch_GitHub_metrics.py --input reads it
+OUT_FIELDS = [
+    "biotoolsID",  # empty: not registered
+    "github_urls",
+    "full_name",
+    "created_at",
+    "stargazers_count",
+    "topics",
+    "query",
+]
+
+QUERIES = [
+    "topic:bioinformatics",
+    "topic:computational-biology",
+    "topic:genomics",
+    "bioinformatics in:name,description,topics",
+]
+SINCE = "2008-01-01"  # GitHub launch
+SEARCH_CAP = 1000  # results GitHub returns per query, however many match
+PER_PAGE = 100
+MAX_SPLIT = 8  # sub-windows per refinement step
+DEFAULT_WORKERS = 4
+
+
+def _ts(text: str) -> int:
+    """YYYY-MM-DD[THH:MM:SSZ] -> UTC epoch seconds."""
+    fmt = "%Y-%m-%dT%H:%M:%SZ" if "T" in text else "%Y-%m-%d"
+    return int(datetime.strptime(text, fmt).replace(tzinfo=timezone.utc).timestamp())
+
+
+def _iso(ts: int) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# --------- Search ----------
+def search_page(query: str, start: int, end: int, page: int = 1) -> dict:
+    """One page of /search/repositories for query, created within [start, end]."""
+    r = fg.POOL.request(
+        "GET",
+        fg.REST_URL + "/search/repositories",
+        "search",
+        params={
+            "q": f"{query} created:{_iso(start)}..{_iso(end)}",
+            "per_page": PER_PAGE,
+            "page": page,
+        },
+        timeout=30,
+    )
+    if r.status_code != 200:
+        raise RuntimeError(f"search {query!r} page {page} -> {r.status_code}: {r.text[:200]}")
+    return r.json()
+
+
+def split_window(
+    start: int, end: int, total: int, cap: int = SEARCH_CAP
+) -> list[tuple[int, int]]:
+    """Equal sub-windows, enough that each would hold about half the cap on average."""
+    parts = min(MAX_SPLIT, end - start + 1, max(2, math.ceil(2 * total / cap)))
+    bounds = [start + (end - start + 1) * i // parts for i in range(parts + 1)]
+    return [(bounds[i], bounds[i + 1] - 1) for i in range(parts)]
+
+
+def search_window(query: str, start: int, end: int, cap: int = SEARCH_CAP):
+    """
+    Worker: all results of query in [start, end], or the sub-windows to
+    search instead if it matches more than the cap. Returns
+    (items, sub-windows, calls made).
+    """
+    first = search_page(query, start, end)
+    total = first.get("total_count", 0)
+    if total > cap and end > start:
+        return [], split_window(start, end, total, cap), 1
+    if total > cap:
+        sys.stderr.write(f"[WARN] {query!r} at {_iso(start)}: {total} results, only {cap} reachable\n")
+    if first.get("incomplete_results"):
+        sys.stderr.write(f"[WARN] {query!r} {_iso(start)}..{_iso(end)}: incomplete results\n")
+
+    items = list(first.get("items") or [])
+    pages = math.ceil(min(total, cap) / PER_PAGE)
+    for page in range(2, pages + 1):
+        items.extend(search_page(query, start, end, page).get("items") or [])
+    return items, [], pages or 1
+
+
+def discover(
+    queries: list[str],
+    since: int,
+    until: int,
+    known: RepoIndex,
+    workers: int = DEFAULT_WORKERS,
+    stats: t.Optional[Counter] = None,
+    cap: int = SEARCH_CAP,
+) -> t.Iterator[dict]:
+    """
+    Search every query over [since, until], refining date windows until
+    each fits under the cap; windows run in parallel on the shared token
+    pool. Yields each repository not in `known` once, as it is found.
+    """
+    stats = Counter() if stats is None else stats
+    seen: set[str] = set()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(search_window, q, since, until, cap): q for q in queries}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                query = pending.pop(fut)
+                try:
+                    items, windows, calls = fut.result()
+                except Exception as e:
+                    sys.stderr.write(f"[WARN] {query!r}: {e}\n")
+                    stats["failed_windows"] += 1
+                    continue
+                stats["calls"] += calls
+                stats["windows"] += 1
+                if windows:
+                    stats["split_windows"] += 1
+                for start, end in windows:
+                    pending[pool.submit(search_window, query, start, end, cap)] = query
+
+                for item in items:
+                    stats["results"] += 1
+                    key = (item.get("full_name") or "").lower()
+                    if not key or key in seen:
+                        continue
+                    seen.add(key)
+                    if key in known:
+                        stats["registered"] += 1
+                        continue
+                    stats["candidates"] += 1
+                    yield {
+                        "biotoolsID": "",
+                        "github_urls": item.get("html_url") or f"https://github.com/{item['full_name']}",
+                        "full_name": item["full_name"],
+                        "created_at": item.get("created_at"),
+                        "stargazers_count": item.get("stargazers_count"),
+                        "topics": ";".join(item.get("topics") or []),
+                        "query": query,
+                    }
+
+
+# --------- Registry side ----------
+def registry_index(rows: t.Iterable[dict], cache: t.Optional[RepoCache] = None) -> RepoIndex:
+    """
+    Normalized owner/repo of every GitHub link in the registry map, plus the
+    canonical names of renamed ones (search reports repositories by their new name).
+    """
+    index = RepoIndex()
+    for row in rows:
+        for url in (row.get("github_urls") or "").split(";"):
+            key = repo_key(url) if "github.com" in url.lower() else None
+            if not key:
+                continue
+            index.add(key)
+            if cache is not None:
+                index.add("/".join(cache.canonical(*key.split("/", 1))).lower())
+    return index
+
+
+# --------- Main pipeline ----------
+def main():
+    ap = argparse.ArgumentParser(
+        description="Find GitHub repositories matching bioinformatics searches that bio.tools does not list."
+    )
+    ap.add_argument("--query", action="append", help="search query, repeatable (default: built-in list)")
+    ap.add_argument("--since", default=SINCE, help="earliest creation date, YYYY-MM-DD")
+    ap.add_argument("--until", help="latest creation date (default: now)")
+    ap.add_argument(
+        "--map-csv",
+        help=f"registry map to deduplicate against (default: {fg.INPUT_CSV}, or the --db store)",
+    )
+    ap.add_argument(
+        "--db",
+        help="record the candidates in this store (store.py), and read the registry map "
+        "from it unless --map-csv is given",
+    )
+    ap.add_argument("--output", default=OUTPUT_CSV)
+    ap.add_argument(
+        "--metrics",
+        metavar="CSV",
+        help="also harvest metrics of each candidate as it is found (with --db, into the store too)",
+    )
+    ap.add_argument("--cache", default=CACHE_JSON)
+    ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="parallel search windows")
+    ap.add_argument(
+        "--search-cap",
+        type=int,
+        default=SEARCH_CAP,
+        help="results reachable per query (lower it to match mock_api_server --search-cap)",
+    )
+    ap.add_argument(
+        "--harvest-workers",
+        type=int,
+        help=f"with --metrics: repositories harvested concurrently "
+        f"(default: {fg.WORKERS_PER_TOKEN} per token)",
+    )
+    args = ap.parse_args()
+
+    if not fg.POOL.tokens:
+        sys.stderr.write(
+            "ERROR: Please set GITHUB_TOKEN (or GITHUB_TOKENS) in your environment.\n"
+        )
+        sys.exit(1)
+    fg.CACHE = RepoCache(args.cache)
+
+    db = None
+    if args.db:
+        import store
+
+        db = store.connect(args.db)
+    if db is not None and not args.map_csv:
+        known = registry_index(store.iter_map_rows(db), fg.CACHE)
+    else:
+        with open(args.map_csv or fg.INPUT_CSV, newline="", encoding="utf-8") as f:
+            known = registry_index(csv.DictReader(f), fg.CACHE)
+
+    since = _ts(args.since)
+    if args.until:
+        until = _ts(args.until) + (0 if "T" in args.until else 86399)  # whole last day
+    else:
+        until = int(datetime.now(timezone.utc).timestamp())
+    stats: Counter = Counter()
+    harvested_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    f = open(args.output, "w", newline="", encoding="utf-8")
+    mf = open(args.metrics, "w", newline="", encoding="utf-8") if args.metrics else None
+    found, batch = [], []
+
+    def candidates():
+        for row in discover(
+            args.query or QUERIES, since, until, known, args.workers, stats, args.search_cap
+        ):
+            w.writerow(row)
+            f.flush()
+            found.append(row)
+            yield row
+
+    try:
+        w = csv.DictWriter(f, fieldnames=OUT_FIELDS)
+        w.writeheader()
+        if mf:
+            mw = csv.DictWriter(mf, fieldnames=fg.OUT_FIELDS)
+            mw.writeheader()
+            # searches keep running in their pool while the harvester's pool works
+            workers = args.harvest_workers or fg.WORKERS_PER_TOKEN * len(fg.POOL)
+            for out in fg.harvest_rows(candidates(), workers):
+                mw.writerow(out)
+                batch.append(out)
+                if len(found) >= 500:
+                    _flush(db, found, batch, harvested_at)
+                    found, batch = [], []
+        else:
+            for _ in candidates():
+                if len(found) >= 500:
+                    _flush(db, found, batch, harvested_at)
+                    found = []
+    finally:
+        _flush(db, found, batch, harvested_at)
+        for h in (f, mf, db):
+            if h is not None:
+                h.close()
+
+    print(
+        f"Searched {stats['windows']:,} windows ({stats['split_windows']:,} refined, "
+        f"{stats['calls']:,} calls): {stats['results']:,} results, "
+        f"{stats['registered']:,} already in bio.tools, {stats['candidates']:,} candidates"
+    )
+    print(f"Wrote: {args.output}")
+    if args.metrics:
+        print(f"Wrote: {args.metrics}")
+    if db is not None:
+        print(f"Updated: {args.db}")
+    for usage in fg.POOL.report():
+        print(f"  token {usage['token']}: {usage['requests']}")
+
+
+def _flush(db, found: list, batch: list, taken_at: str):
+    """Save the cache; with --db, upsert the candidates and their metrics."""
+    fg.CACHE.save()
+    if db is not None and found:
+        import store
+
+        store.upsert_candidates(db, found)
+        store.upsert_metrics(db, batch, "api", taken_at)
+        store.upsert_repositories(db, [fg.repository_state(r) for r in batch if r.get("owner")])
+
+
+if __name__ == "__main__":
+    main()
@@ -3,34 +3,61 @@ import os
 import re
 import csv
 import sys
-import time
+import glob
 import math
 import json
+import socket
+import hashlib
+import argparse
+import threading
 import typing as t
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
-import requests
+from registry_dump import DumpWriter, index_path, merge_dumps
+from repo_cache import CACHE_JSON, RepoCache
+from repo_overlap import key_hash
+from token_pool import TokenPool
 
 # --------- Input/Output ----------
 INPUT_CSV = "biotools_github_map.csv"  # expects: biotoolsID, github_urls
 OUTPUT_CSV = "biotools_with_metrics.csv"
 
+METRIC_FIELDS = [
+    "repo.stargazers_count",
+    "repo.watchers_count",
+    "repo.subscribers_count",
+    "repo.forks_count",
+    "repo.open_issues_count",
+    "repo.network_count",
+    "num_contributors",
+    "num_releases",
+    "num_commits",
+    "num_pulls",
+    "avg_time_to_close_days",
+    "repo.archived",
+]
+OUT_FIELDS = ["biotoolsID", "owner", "repo", "repo_url", *METRIC_FIELDS]
+
 # --------- Auth / HTTP -----------
-if not GITHUB_TOKEN:
-    sys.stderr.write("ERROR: Please set GITHUB_TOKEN in your environment.\n")
-    sys.exit(1)
-
-SESSION = requests.Session()
-SESSION.headers.update(
-    {
-        "Authorization": f"Bearer {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github+json",
-        "User-Agent": "bio.tools-metrics-script",
-    }
-)
+# GITHUB_TOKENS="tok1,tok2,..." spreads the harvest over several tokens;
+# a single GITHUB_TOKEN still works.
+POOL = TokenPool.from_env()
+
+# deleted/private repositories, renames and archived flags seen by earlier runs
+CACHE = RepoCache(CACHE_JSON)
+
+# with --metadata: block-framed dump receiving one metadata bundle per repository
+METADATA: t.Optional[DumpWriter] = None
+METADATA_LOCK = threading.Lock()  # harvest workers share the writer
 
-GRAPHQL_URL = "https://api.github.com/graphql"
-REST_URL = "https://api.github.com"
+# concurrent harvest_row calls per token; TokenPool budgets each token's requests
+WORKERS_PER_TOKEN = 2
+
+# overridable to point the script at a mirror or at mock_api_server.py
+REST_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GRAPHQL_URL = REST_URL + "/graphql"
 
 # --------- URL parsing -----------
 _GH_RE = re.compile(
@@ -65,15 +92,21 @@ def parse_owner_repo(url: str):
 # --------- HTTP helpers ----------
 def _rest_get(path: str, ok=(200,), allow_redirects=True, params=None):
     url = REST_URL + path
-    r = SESSION.get(url, params=params, allow_redirects=allow_redirects, timeout=30)
+    r = POOL.request(
+        "GET", url, "core", params=params, allow_redirects=allow_redirects, timeout=30
+    )
     if r.status_code not in ok:
         raise RuntimeError(f"REST GET {url} -> {r.status_code}: {r.text[:200]}")
     return r
 
 
 def _graphql(query: str, variables: dict):
-    r = SESSION.post(
-        GRAPHQL_URL, json={"query": query, "variables": variables}, timeout=30
+    r = POOL.request(
+        "POST",
+        GRAPHQL_URL,
+        "graphql",
+        json={"query": query, "variables": variables},
+        timeout=30,
     )
     if r.status_code != 200:
         raise RuntimeError(f"GraphQL {r.status_code}: {r.text[:200]}")
@@ -84,9 +117,13 @@ def _graphql(query: str, variables: dict):
 
 
 # --------- Metrics collection ----------
-GRAPHQL_REPO_QUERY = """
+# {metadata} takes GRAPHQL_METADATA_FIELDS with --metadata, nothing otherwise
+GRAPHQL_REPO_TEMPLATE = """
 query RepoStats($owner:String!, $name:String!) {
   repository(owner:$owner, name:$name) {
+    nameWithOwner                        # canonical name; GraphQL follows renames
+    isArchived
+{metadata}
     stargazerCount
     watchers { totalCount }              # subscribers_count
     forkCount
@@ -108,6 +145,75 @@ query RepoStats($owner:String!, $name:String!) {
 """
 
 
+# metadata bundle for the bridge, fetched in the same round trip with --metadata
+README_PATHS = ["README.md", "README.rst", "README.txt", "README", "readme.md"]
+CITATION_PATH = "CITATION.cff"
+
+
+def _blob_field(alias: str, path: str) -> str:
+    return f'{alias}: object(expression: "HEAD:{path}") {{ ... on Blob {{ text isTruncated }} }}'
+
+
+GRAPHQL_METADATA_FIELDS = "\n".join(
+    "    " + field
+    for field in [
+        "description",
+        "homepageUrl",
+        "licenseInfo { spdxId name }",
+        "repositoryTopics(first: 50) { nodes { topic { name } } }",
+        "languages(first: 20, orderBy: {field: SIZE, direction: DESC}) { edges { size node { name } } }",
+        _blob_field("citation", CITATION_PATH),
+        *(_blob_field(f"readme{i}", path) for i, path in enumerate(README_PATHS)),
+    ]
+)
+
+
+def _repo_query(metadata: str) -> str:
+    """GRAPHQL_REPO_TEMPLATE with the metadata fields (or none) in place of {metadata}."""
+    assert GRAPHQL_REPO_TEMPLATE.count("\n{metadata}\n") == 1, "{metadata} placeholder missing"
+    return GRAPHQL_REPO_TEMPLATE.replace("\n{metadata}\n", "\n" + metadata + "\n" if metadata else "\n")
+
+
+GRAPHQL_REPO_QUERY = _repo_query("")
+GRAPHQL_REPO_METADATA_QUERY = _repo_query(GRAPHQL_METADATA_FIELDS)
+assert GRAPHQL_METADATA_FIELDS in GRAPHQL_REPO_METADATA_QUERY
+assert "{metadata}" not in GRAPHQL_REPO_QUERY + GRAPHQL_REPO_METADATA_QUERY
+
+
+def metadata_bundle(repo_data: dict) -> dict:
+    """License, topics, languages, description, CITATION.cff and README of a GraphQL repository."""
+    readme = None
+    for i, path in enumerate(README_PATHS):
+        blob = repo_data.get(f"readme{i}")
+        if blob and blob.get("text") is not None:
+            readme = {"path": path, "text": blob["text"], "truncated": blob.get("isTruncated")}
+            break
+    citation = repo_data.get("citation") or {}
+    license_info = repo_data.get("licenseInfo") or {}
+    return {
+        "nameWithOwner": repo_data.get("nameWithOwner"),
+        "description": repo_data.get("description"),
+        "homepageUrl": repo_data.get("homepageUrl"),
+        "license": license_info.get("spdxId") or license_info.get("name"),
+        "topics": [
+            n["topic"]["name"]
+            for n in (repo_data.get("repositoryTopics") or {}).get("nodes") or []
+        ],
+        "languages": {
+            e["node"]["name"]: e["size"]
+            for e in (repo_data.get("languages") or {}).get("edges") or []
+        },
+        "citation_cff": citation.get("text"),
+        "readme": readme,
+        "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def metadata_path(output: str) -> str:
+    """Metadata dump next to a metrics CSV (or shard fragment)."""
+    return os.path.splitext(output)[0] + ".metadata.jsonl.gz"
+
+
 def get_contributors_count(owner: str, repo: str) -> int:
     """
     Use REST: /repos/{owner}/{repo}/contributors?per_page=1&anon=1
@@ -160,15 +266,27 @@ def avg_days_to_close(issues_nodes: list[dict]) -> t.Optional[float]:
     return sum(deltas) / len(deltas)
 
 
-def collect_metrics(owner: str, repo: str) -> dict:
+def collect_metrics(owner: str, repo: str, metadata: t.Optional[dict] = None) -> dict:
     """
-    Mix GraphQL and REST to gather the requested metrics.
+    Mix GraphQL and REST to gather the requested metrics. If a `metadata`
+    dict is passed, the metadata bundle is requested in the same GraphQL
+    query and stored into it.
     """
     # GraphQL part
-    data = _graphql(GRAPHQL_REPO_QUERY, {"owner": owner, "name": repo})
+    query = GRAPHQL_REPO_QUERY if metadata is None else GRAPHQL_REPO_METADATA_QUERY
+    data = _graphql(query, {"owner": owner, "name": repo})
     repo_data = data.get("repository")
     if not repo_data:
         raise RuntimeError("Repository not found via GraphQL.")
+    if metadata is not None:
+        metadata.update(metadata_bundle(repo_data))
+
+    # record renames and query REST under the canonical name (no redirects)
+    full_name = repo_data.get("nameWithOwner") or f"{owner}/{repo}"
+    CACHE.mark_renamed(owner, repo, full_name)
+    owner, repo = full_name.split("/", 1)
+    is_archived = repo_data.get("isArchived")
+    CACHE.mark_found(owner, repo, is_archived)
 
     stargazers_count = repo_data.get("stargazerCount") or 0
     subscribers_count = (repo_data.get("watchers") or {}).get("totalCount") or 0
@@ -214,77 +332,369 @@ def collect_metrics(owner: str, repo: str) -> dict:
         "avg_time_to_close_days": (
             round(avg_close, 3) if avg_close is not None else None
         ),
+        "repo.archived": is_archived,
+    }
+
+
+def check_repository(owner: str, repo: str) -> t.Optional[tuple[str, str]]:
+    """
+    After a failed collection, ask REST (which redirects moved repositories)
+    where owner/repo lives now. Records renames and 404/451s in CACHE and
+    returns the canonical (owner, repo), or None if it is gone.
+    """
+    r = _rest_get(f"/repos/{owner}/{repo}", ok=(200, 404, 451))
+    if r.status_code != 200:
+        CACHE.mark_missing(owner, repo, r.status_code)
+        return None
+    data = r.json()
+    full_name = data.get("full_name") or f"{owner}/{repo}"
+    CACHE.mark_renamed(owner, repo, full_name)
+    new_owner, new_repo = full_name.split("/", 1)
+    CACHE.mark_found(new_owner, new_repo, data.get("archived"))
+    return new_owner, new_repo
+
+
+def repository_state(row: dict) -> dict:
+    """Row for the store's repositories table, from a harvested row and CACHE."""
+    canonical = CACHE.canonical(row["owner"], row["repo"])
+    return {
+        "owner": row["owner"],
+        "repo": row["repo"],
+        "canonical": "/".join(canonical),
+        "archived": row.get("repo.archived"),
+        "missing": CACHE.is_missing(*canonical),
     }
 
 
 # --------- Main pipeline ----------
-def main():
-    # read input CSV
-    with open(INPUT_CSV, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-
-    out_fields = [
-        "biotoolsID",
-        "owner",
-        "repo",
-        "repo_url",
-        "repo.stargazers_count",
-        "repo.watchers_count",
-        "repo.subscribers_count",
-        "repo.forks_count",
-        "repo.open_issues_count",
-        "repo.network_count",
-        "num_contributors",
-        "num_releases",
-        "num_commits",
-        "num_pulls",
-        "avg_time_to_close_days",
-    ]
+def row_target(row: dict) -> tuple[str, str, t.Optional[list]]:
+    """(biotoolsID, first GitHub URL or "", [owner, repo] or None) of an input row."""
+    biotools_id = (row.get("biotoolsID") or "").strip()
+    urls = (row.get("github_urls") or "").split(";")
+    url = next((u.strip() for u in urls if "github.com" in u.lower()), "")
+    return biotools_id, url, parse_owner_repo(url) if url else None
+
+
+def harvest_row(row: dict) -> dict:
+    """Output row (metrics included) for one input row."""
+    biotools_id, url, parsed = row_target(row)
+
+    if not url:
+        return {"biotoolsID": biotools_id}
+
+    if not parsed:
+        return {"biotoolsID": biotools_id, "repo_url": url}
+
+    owner, repo = parsed
+    metrics = {k: None for k in METRIC_FIELDS}
+    target = CACHE.canonical(owner, repo)
+    key = f"{owner}/{repo}".lower()
+    # one bundle per repository, however many tools point at it
+    with METADATA_LOCK:
+        bundle = {} if METADATA is not None and key not in METADATA.ids else None
+
+    if CACHE.is_missing(*target):
+        # known dead within the TTL: no API calls
+        metrics["repo.archived"] = CACHE.archived(*target)
+    else:
+        try:
+            metrics = collect_metrics(*target, metadata=bundle)
+        except Exception as e:
+            # follow repository moves/redirects via REST /repos to get canonical full_name
+            try:
+                moved = check_repository(*target)
+                if moved is None:
+                    sys.stderr.write(f"[WARN] {owner}/{repo}: not found, cached as missing\n")
+                elif moved != target:
+                    metrics = collect_metrics(*moved, metadata=bundle)
+                else:
+                    sys.stderr.write(f"[WARN] {owner}/{repo}: {e}\n")
+            except Exception as e2:
+                sys.stderr.write(f"[WARN] {owner}/{repo}: {e2}\n")
+
+    if bundle:
+        with METADATA_LOCK:
+            if key not in METADATA.ids:  # another worker may have had the same repository
+                METADATA.write(json.dumps(bundle).encode("utf-8"), key)
+
+    return {
+        "biotoolsID": biotools_id,
+        "owner": owner,
+        "repo": repo,
+        "repo_url": url,
+        **metrics,
+    }
 
-    with open(OUTPUT_CSV, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=out_fields)
-        w.writeheader()
 
-        for row in rows:
-            biotools_id = (row.get("biotoolsID") or "").strip()
-            urls = (row.get("github_urls") or "").split(";")
-            url = next((u.strip() for u in urls if "github.com" in u.lower()), "")
+def harvest_rows(rows: t.Iterable[dict], workers: int) -> t.Iterator[dict]:
+    """
+    harvest_row over rows on a thread pool, yielding output rows in input
+    order. Only a few rows per worker are in flight, so an interrupted run
+    leaves little unfinished work behind.
+    """
+    if workers <= 1:
+        yield from map(harvest_row, rows)
+        return
+    pending: deque = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            for row in rows:
+                pending.append(pool.submit(harvest_row, row))
+                if len(pending) >= 4 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for fut in pending:
+                fut.cancel()
+
+
+# --------- Sharding ----------
+def shard_of(row: dict, shards: int) -> int:
+    """
+    Stable shard of an input row: by normalized owner/repo, so every tool
+    pointing at one repository lands in the same shard; by biotoolsID for
+    rows without a repository.
+    """
+    biotools_id, _, parsed = row_target(row)
+    key = f"{parsed[0]}/{parsed[1]}".lower() if parsed else f"biotoolsID:{biotools_id}"
+    return key_hash(key) % shards
 
-            if not url:
-                w.writerow({"biotoolsID": biotools_id})
-                continue
 
-            parsed = parse_owner_repo(url)
-            if not parsed:
-                w.writerow({"biotoolsID": biotools_id, "repo_url": url})
-                continue
+def parse_shard(spec: str) -> tuple[int, int]:
+    """'i/N' -> (i, N), 0 <= i < N."""
+    m = re.fullmatch(r"(\d+)/(\d+)", spec.strip())
+    if not m or not int(m.group(1)) < int(m.group(2)):
+        raise ValueError(f"--shard expects i/N with 0 <= i < N, got {spec!r}")
+    return int(m.group(1)), int(m.group(2))
 
-            owner, repo = parsed
 
-            try:
-                metrics = collect_metrics(owner, repo)
-            except Exception as e:
-                # follow repository moves/redirects via REST /repos to get canonical full_name if needed
-                sys.stderr.write(f"[WARN] {owner}/{repo}: {e}\n")
-                metrics = {
-                    k: None
-                    for k in out_fields
-                    if k not in ("biotoolsID", "owner", "repo", "repo_url")
-                }
-
-            out = {
-                "biotoolsID": biotools_id,
-                "owner": owner,
-                "repo": repo,
-                "repo_url": url,
-                **metrics,
-            }
-            w.writerow(out)
-            # Be gentle on rate limits
-            time.sleep(0.2)
-
-    print(f"Wrote: {OUTPUT_CSV}")
+def fragment_path(output: str, shard: int, shards: int) -> str:
+    stem, ext = os.path.splitext(output)
+    return f"{stem}.shard-{shard:03d}-of-{shards:03d}{ext}"
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def merge_fragments(input_csv: str, fragments: list[str], output: str):
+    """
+    Reassemble shard fragments into one CSV in input (biotoolsID) order.
+    Fails on missing, duplicated, incomplete or foreign fragments.
+    """
+    metas = []
+    for path in fragments:
+        try:
+            with open(path + ".meta.json", encoding="utf-8") as f:
+                metas.append((path, json.load(f)))
+        except FileNotFoundError:
+            raise RuntimeError(f"{path}: no run metadata, shard did not finish")
+
+    if not metas:
+        raise RuntimeError("no shard fragments to merge")
+    shards = {m["shards"] for _, m in metas}
+    if len(shards) != 1:
+        raise RuntimeError(f"fragments disagree on the shard count: {sorted(shards)}")
+    shards = shards.pop()
+
+    for path, meta in metas:
+        if meta.get("input_sha256") is None:
+            raise RuntimeError(
+                f"{path}: harvested from the store {meta.get('input')!r}, not a map CSV; "
+                "store-backed shards are merged in the store, export them with store.py export"
+            )
+    input_sha = _sha256(input_csv)
+    by_index: dict[int, str] = {}
+    for path, meta in metas:
+        if meta["input_sha256"] != input_sha:
+            raise RuntimeError(f"{path}: harvested from a different {input_csv}")
+        if meta["shard"] in by_index:
+            raise RuntimeError(
+                f"shard {meta['shard']} is duplicated: {by_index[meta['shard']]}, {path}"
+            )
+        by_index[meta["shard"]] = path
+    missing = sorted(set(range(shards)) - set(by_index))
+    if missing:
+        raise RuntimeError(f"missing shard(s) {missing} of {shards}")
+
+    handles = [open(by_index[i], newline="", encoding="utf-8") for i in range(shards)]
+    try:
+        readers = [csv.DictReader(h) for h in handles]
+        with open(input_csv, newline="", encoding="utf-8") as f, open(
+            output, "w", newline="", encoding="utf-8"
+        ) as out:
+            w = csv.DictWriter(out, fieldnames=OUT_FIELDS)
+            w.writeheader()
+            for row in csv.DictReader(f):
+                i = shard_of(row, shards)
+                frag = next(readers[i], None)
+                expected = (row.get("biotoolsID") or "").strip()
+                if frag is None or frag["biotoolsID"] != expected:
+                    raise RuntimeError(
+                        f"{by_index[i]} is out of sync with {input_csv} at {expected!r}"
+                    )
+                w.writerow(frag)
+        for i, reader in enumerate(readers):
+            if next(reader, None) is not None:
+                raise RuntimeError(f"{by_index[i]} has rows not in {input_csv}")
+    finally:
+        for h in handles:
+            h.close()
+
+
+# --------- CLI ----------
+def main():
+    ap = argparse.ArgumentParser(
+        description="Harvest GitHub metrics for the repositories in the map CSV."
+    )
+    ap.add_argument("--input", help=f"map CSV (default: {INPUT_CSV}, or the --db store)")
+    ap.add_argument("--output", default=OUTPUT_CSV)
+    ap.add_argument(
+        "--db",
+        help="SQLite store (store.py): read the map from it unless --input is given "
+        "and upsert a metrics snapshot; shards can share one store instead of --merge",
+    )
+    ap.add_argument("--shard", help="i/N: harvest only shard i (0-based) of N")
+    ap.add_argument(
+        "--cache",
+        default=CACHE_JSON,
+        help="negative/rename cache shared between runs (and shards)",
+    )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        help=f"repositories harvested concurrently (default: {WORKERS_PER_TOKEN} per token)",
+    )
+    ap.add_argument(
+        "--metadata",
+        action="store_true",
+        help="also fetch license, topics, languages, CITATION.cff and README in the same "
+        "GraphQL query, into a compressed dump next to --output",
+    )
+    ap.add_argument(
+        "--merge",
+        nargs="*",
+        metavar="FRAGMENT",
+        help="merge shard fragments (default: all next to --output) and exit",
+    )
+    args = ap.parse_args()
+
+    if args.merge is not None:
+        stem, ext = os.path.splitext(args.output)
+        fragments = args.merge or sorted(glob.glob(f"{stem}.shard-*-of-*{ext}"))
+        try:
+            merge_fragments(args.input or INPUT_CSV, fragments, args.output)
+        except RuntimeError as e:
+            sys.stderr.write(f"ERROR: {e}\n")
+            sys.exit(1)
+        print(f"Merged {len(fragments)} fragments into {args.output}")
+        dumps = [metadata_path(p) for p in fragments]
+        complete = [p for p in dumps if os.path.exists(index_path(p))]
+        if complete and len(complete) < len(dumps):
+            sys.stderr.write(
+                f"[WARN] {len(dumps) - len(complete)} shard(s) have no complete metadata dump; "
+                "metadata not merged\n"
+            )
+        elif complete:
+            merge_dumps(dumps, metadata_path(args.output))
+            print(f"Merged their metadata into {metadata_path(args.output)}")
+        return
+
+    if not POOL.tokens:
+        sys.stderr.write(
+            "ERROR: Please set GITHUB_TOKEN (or GITHUB_TOKENS) in your environment.\n"
+        )
+        sys.exit(1)
+
+    global CACHE, METADATA
+    CACHE = RepoCache(args.cache)
+
+    shard, shards = parse_shard(args.shard) if args.shard else (0, 1)
+    output = fragment_path(args.output, shard, shards) if args.shard else args.output
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    db = None
+    if args.db:
+        import store
+
+        db = store.connect(args.db)
+
+    # read input CSV (or the map view of the store)
+    if db is not None and not args.input:
+        reader = store.iter_map_rows(db)
+        rows = [row for row in reader if shards == 1 or shard_of(row, shards) == shard]
+    else:
+        args.input = args.input or INPUT_CSV
+        with open(args.input, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            rows = [row for row in reader if shards == 1 or shard_of(row, shards) == shard]
+
+    def flush(batch: list):
+        CACHE.save()
+        if db is not None:
+            store.upsert_metrics(db, batch, "api", started_at)
+            store.upsert_repositories(
+                db, [repository_state(r) for r in batch if r.get("owner")]
+            )
+
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=OUT_FIELDS)
+        w.writeheader()
+
+        if args.metadata:
+            METADATA = DumpWriter(metadata_path(output), block_tools=200)
+        batch = []
+        try:
+            for out in harvest_rows(rows, args.workers or WORKERS_PER_TOKEN * len(POOL)):
+                w.writerow(out)
+                batch.append(out)
+                if len(batch) >= 500:
+                    flush(batch)
+                    batch = []
+        except BaseException:
+            if METADATA is not None:
+                METADATA.abort()  # no index: an interrupted dump is never taken as complete
+            raise
+        finally:
+            flush(batch)
+        if METADATA is not None:
+            METADATA.close()
+
+    if args.shard:
+        # written last: a fragment without metadata is an unfinished shard
+        with open(output + ".meta.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "shard": shard,
+                    "shards": shards,
+                    "rows": len(rows),
+                    "input": os.path.basename(args.input or args.db),
+                    # a live store has no stable digest; its shards are not merged
+                    "input_sha256": _sha256(args.input) if args.input else None,
+                    "host": socket.gethostname(),
+                    "tokens": len(POOL),
+                    "started_at": started_at,
+                    "finished_at": datetime.now(timezone.utc).isoformat(
+                        timespec="seconds"
+                    ),
+                },
+                f,
+                indent=2,
+            )
+
+    print(f"Wrote: {output}")
+    if args.metadata:
+        print(f"Wrote: {metadata_path(output)}")
+    if db is not None:
+        db.close()
+        print(f"Updated: {args.db}")
+    for usage in POOL.report():
+        print(f"  token {usage['token']}: {usage['requests']}")
 
 
 if __name__ == "__main__":
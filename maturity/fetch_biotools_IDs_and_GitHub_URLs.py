@@ -1,47 +1,105 @@
 #!/usr/bin/env python3
-import sys
+import os
 import json
 import io
 import gzip
 import csv
 import re
+import argparse
 import urllib.request
 
-BIOTOOLS_API_URL = "https://bio.tools/api/tool/"
-OUTPUT_JSON = "backup.json"
+from registry_dump import DumpWriter, index_path
+
+BIOTOOLS_API_URL = os.environ.get("BIOTOOLS_API_URL", "https://bio.tools/api/tool/")
+OUTPUT_JSON = "backup.jsonl.gz"  # a name ending in .json writes the legacy JSON array
 OUTPUT_CSV = "biotools_github_map.csv"
 
 
 def main():
-    json_fname = OUTPUT_JSON if (len(sys.argv) < 2) else sys.argv[1]
+    ap = argparse.ArgumentParser(
+        description="Dump the bio.tools registry and map tools to GitHub URLs."
+    )
+    ap.add_argument("json_fname", nargs="?", default=OUTPUT_JSON, help="backup file")
+    ap.add_argument("--db", help="also upsert tools and repo links into this store (store.py)")
+    args = ap.parse_args()
+    json_fname = args.json_fname
 
     reader = BiotoolsReader()
     it = reader.iterator  # BiotoolsIterator yielding one tool (bytes) at a time
 
-    # --- write JSON backup (streamed array) and CSV mapping in one pass ---
-    with open(json_fname, "wb") as jf, open(
-        OUTPUT_CSV, "w", newline="", encoding="utf-8"
+    db = None
+    if args.db:
+        import store
+
+        db = store.connect(args.db)
+    write_outputs(it, json_fname, OUTPUT_CSV, db)
+
+    print(f"Wrote JSON to {json_fname}")
+    if not json_fname.endswith(".json"):
+        print(f"Wrote index to {index_path(json_fname)}")
+    print(f"Wrote CSV  to {OUTPUT_CSV}")
+    if db is not None:
+        db.close()
+        print(f"Updated {args.db}")
+
+
+class JsonArrayWriter:
+    """Legacy backup: all tools streamed into one uncompressed JSON array."""
+
+    def __init__(self, path: str):
+        self._f = open(path, "wb")
+        self._f.write(b"[")
+        self._first = True
+
+    def write(self, tool_bytes: bytes, biotools_id=None):
+        # comma between items
+        if not self._first:
+            self._f.write(b",")
+        self._f.write(tool_bytes)
+        self._first = False
+
+    def close(self):
+        if not self._f.closed:
+            self._f.write(b"]")
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self._f.close()  # no closing bracket: an interrupted backup stays unparseable
+
+
+def write_outputs(it, json_fname: str, csv_fname: str, db=None):
+    """
+    Write the backup and the CSV mapping in one pass. The backup is a
+    block-framed .jsonl.gz with a biotoolsID index (see registry_dump.py),
+    or the legacy JSON array if json_fname ends in .json. With a store
+    connection (db), tools and their links are upserted in batches too.
+    """
+    if db is not None:
+        import store
+    batch = []
+    backup = JsonArrayWriter if json_fname.endswith(".json") else DumpWriter
+    with backup(json_fname) as jf, open(
+        csv_fname, "w", newline="", encoding="utf-8"
     ) as cf:
         writer = csv.DictWriter(cf, fieldnames=["biotoolsID", "github_urls"])
         writer.writeheader()
 
-        jf.write(b"[")
-        first = True
-
         for tool_bytes in it:
-            # write JSON (comma between items)
-            if not first:
-                jf.write(b",")
-            jf.write(tool_bytes)
-            first = False
-
             # parse and write CSV row
             try:
                 tool = json.loads(tool_bytes.decode("utf-8"))
             except Exception:
+                jf.write(tool_bytes)
                 continue
 
             biotools_id = str(tool.get("biotoolsID", "")).strip()
+            jf.write(tool_bytes, biotools_id)
             urls = extract_github_urls(tool)
 
             writer.writerow(
@@ -51,10 +109,16 @@ def main():
                 }
             )
 
-        jf.write(b"]")
+            if db is not None:
+                batch.append(
+                    {"biotoolsID": biotools_id, "name": tool.get("name"), "github_urls": urls}
+                )
+                if len(batch) >= store.BATCH_ROWS:
+                    store.upsert_tools(db, batch)
+                    batch = []
 
-    print(f"Wrote JSON to {json_fname}")
-    print(f"Wrote CSV  to {OUTPUT_CSV}")
+        if batch:
+            store.upsert_tools(db, batch)
 
 
 # -----------------------------
@@ -1,3 +1,6 @@
+import os
+import argparse
+
 import pandas as pd
 import requests
 
@@ -6,7 +9,7 @@ IN_CSV = "biotools_with_metrics.csv"
 OUT_CSV = "biotools_with_metrics_and_maturity.csv"
 
 # Base URL for bio.tools API
-BASE_URL = "https://bio.tools/api/tool"
+BASE_URL = os.environ.get("BIOTOOLS_API_URL", "https://bio.tools/api/tool").rstrip("/")
 
 
 def fetch_maturity(biotools_id: str) -> str:
@@ -32,8 +35,46 @@ def fetch_maturity(biotools_id: str) -> str:
         return "None"
 
 
+def update_store(db, missing_only: bool = False) -> int:
+    """Fetch maturity for the store's tools (or only those without one yet) and upsert it."""
+    import store
+
+    if missing_only:
+        ids = store.tools_without_maturity(db)
+    else:
+        ids = [r[0] for r in db.execute("SELECT biotoolsID FROM tools ORDER BY rowid")]
+    for batch in store.batched(ids):
+        store.upsert_maturity(db, [(i, fetch_maturity(i)) for i in batch])
+    return len(ids)
+
+
 def main():
-    df = pd.read_csv(IN_CSV)
+    ap = argparse.ArgumentParser(description="Annotate the metrics table with bio.tools maturity.")
+    ap.add_argument("--input", default=IN_CSV)
+    ap.add_argument("--output", default=OUT_CSV)
+    ap.add_argument(
+        "--db",
+        help="SQLite store (store.py): upsert maturity there and export --output from it",
+    )
+    ap.add_argument(
+        "--missing-only",
+        action="store_true",
+        help="with --db, only fetch tools that have no maturity yet",
+    )
+    args = ap.parse_args()
+
+    if args.db:
+        import store
+
+        db = store.connect(args.db)
+        n = update_store(db, args.missing_only)
+        print(f"Updated maturity of {n:,} tools in {args.db}")
+        store.export_view(db, "biotools_with_metrics_and_maturity", args.output)
+        db.close()
+        print(f"Wrote {args.output}")
+        return
+
+    df = pd.read_csv(args.input)
 
     # Make sure the column name matches your header exactly
     if "biotoolsID" not in df.columns:
@@ -41,8 +82,8 @@ def main():
 
     df["maturity"] = df["biotoolsID"].apply(fetch_maturity)
 
-    df.to_csv(OUT_CSV, index=False)
-    print(f"Wrote {OUT_CSV}")
+    df.to_csv(args.output, index=False)
+    print(f"Wrote {args.output}")
 
 
 if __name__ == "__main__":
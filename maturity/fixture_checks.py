@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+import os
+import csv
+import sys
+import gzip
+import json
+import argparse
+import time
+import shutil
+import tempfile
+import subprocess
+import typing as t
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+# -----------------------------
+# Helpers
+# -----------------------------
+class Check:
+    """Collects mismatches of one check instead of stopping at the first."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.failures: list[str] = []
+
+    def expect(self, what: str, got, want):
+        if got != want:
+            self.failures.append(f"{what}: got {got!r}, want {want!r}")
+
+
+def _run(*args: str, cwd: str, env: t.Optional[dict] = None):
+    """Run a pipeline script the way a user would; raise with its stderr on failure."""
+    r = subprocess.run(
+        [sys.executable, os.path.join(HERE, args[0]), *args[1:]],
+        cwd=cwd,
+        env=dict(os.environ, **(env or {})),
+        capture_output=True,
+        text=True,
+    )
+    if r.returncode != 0:
+        raise RuntimeError(f"{args[0]} -> {r.returncode}: {r.stderr.strip()[-500:]}")
+    return r.stdout
+
+
+def _write_map(path: str, rows: list[tuple[str, str]]):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["biotoolsID", "github_urls"])
+        w.writerows(rows)
+
+
+def _read_rows(path: str) -> dict[str, dict]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return {row["biotoolsID"]: row for row in csv.DictReader(f)}
+
+
+# -----------------------------
+# GH Archive ingestion (gharchive_metrics.py)
+# -----------------------------
+def _gh_event(n: int, kind: str, name: str, payload: dict, created_at: str) -> dict:
+    # key order of the real archive: the raw-line regex depends on it
+    return {
+        "id": str(1_000_000 + n),
+        "type": kind,
+        "actor": {"id": n, "login": f"user{n}"},
+        "repo": {"id": 100 + len(name), "name": name, "url": f"https://api.github.com/repos/{name}"},
+        "payload": payload,
+        "public": True,
+        "created_at": created_at,
+    }
+
+
+def _issue(created_at: str, closed_at=None) -> dict:
+    return {"created_at": created_at, "closed_at": closed_at}
+
+
+def write_gharchive_fixture(directory: str) -> list[str]:
+    """
+    Two hourly archives for Bio/Tool (mixed case on purpose), a repository
+    with a single star, and a decoy repository. Compact lines take the regex fast path; lines written with
+    default separators, as some re-encoded mirrors do, take the JSON fallback.
+    """
+    hour1 = [
+        ("compact", _gh_event(1, "WatchEvent", "Bio/Tool", {"action": "started"}, "2025-01-01T15:00:01Z")),
+        ("compact", _gh_event(2, "WatchEvent", "other/decoy", {"action": "started"}, "2025-01-01T15:00:02Z")),
+        ("spaced", _gh_event(3, "ForkEvent", "Bio/Tool", {"forkee": {}}, "2025-01-01T15:00:03Z")),
+        ("spaced", _gh_event(4, "ForkEvent", "other/decoy", {"forkee": {}}, "2025-01-01T15:00:04Z")),
+        (
+            "compact",
+            _gh_event(
+                5,
+                "PushEvent",
+                "Bio/Tool",
+                {
+                    "size": 4,
+                    "distinct_size": 3,
+                    "commits": [
+                        {"author": {"email": "Ann@Example.org"}, "distinct": True},
+                        {"author": {"email": "ann@example.org"}, "distinct": True},
+                        {"author": {"email": "bob@example.org"}, "distinct": True},
+                        {"author": {"email": "merged@example.org"}, "distinct": False},
+                    ],
+                },
+                "2025-01-01T15:10:00Z",
+            ),
+        ),
+        ("raw", b'{"id":"broken", "type": "WatchEvent", "repo":'),
+    ]
+    hour2 = [
+        (
+            "compact",
+            _gh_event(
+                6, "IssuesEvent", "Bio/Tool",
+                {"action": "opened", "issue": _issue("2025-01-01T16:00:00Z")},
+                "2025-01-01T16:00:00Z",
+            ),
+        ),
+        (
+            "compact",
+            _gh_event(
+                7, "IssuesEvent", "Bio/Tool",
+                {"action": "closed", "issue": _issue("2024-12-29T16:00:00Z", "2024-12-31T16:00:00Z")},
+                "2025-01-01T16:01:00Z",
+            ),
+        ),
+        (
+            "spaced",
+            _gh_event(
+                8, "IssuesEvent", "Bio/Tool",
+                {"action": "closed", "issue": _issue("2024-12-28T16:00:00Z", "2025-01-01T16:00:00Z")},
+                "2025-01-01T16:02:00Z",
+            ),
+        ),
+        ("compact", _gh_event(9, "ReleaseEvent", "Bio/Tool", {"action": "published"}, "2025-01-01T16:03:00Z")),
+        ("compact", _gh_event(10, "PullRequestEvent", "Bio/Tool", {"action": "opened"}, "2025-01-01T16:04:00Z")),
+        ("compact", _gh_event(11, "PushEvent", "Bio/Tool", {"size": 2}, "2025-01-01T16:59:59Z")),
+        ("compact", _gh_event(12, "WatchEvent", "bio/quiet", {"action": "started"}, "2025-01-01T16:30:00Z")),
+    ]
+
+    paths = []
+    for hour, events in (("2025-01-01-15", hour1), ("2025-01-01-16", hour2)):
+        path = os.path.join(directory, f"{hour}.json.gz")
+        with gzip.open(path, "wb") as f:
+            for style, event in events:
+                if style == "raw":
+                    line = event
+                elif style == "compact":
+                    line = json.dumps(event, separators=(",", ":")).encode("utf-8")
+                else:
+                    line = json.dumps(event).encode("utf-8")
+                f.write(line + b"\n")
+        paths.append(path)
+    return paths
+
+
+def check_gharchive(tmp: str) -> Check:
+    import gharchive_metrics as gm
+
+    c = Check("gharchive")
+    archives = os.path.join(tmp, "gharchive")
+    os.makedirs(archives)
+    paths = write_gharchive_fixture(archives)
+
+    # the fast path must see the real layout, and only that layout
+    compact = json.dumps(_gh_event(0, "WatchEvent", "Bio/Tool", {}, ""), separators=(",", ":"))
+    spaced = json.dumps(_gh_event(0, "WatchEvent", "Bio/Tool", {}, ""))
+    m = gm._REPO_NAME_RE.search(compact.encode("utf-8"))
+    c.expect("regex on a compact line", m and m.group(1), b"Bio/Tool")
+    c.expect("regex on a spaced line", gm._REPO_NAME_RE.search(spaced.encode("utf-8")), None)
+
+    gm._init_worker(["bio/tool"])
+    _, kept, counts = gm.scan_archive(paths[0])
+    c.expect("events kept from hour 15", kept, 3)
+    c.expect("repositories seen in hour 15", sorted(counts), ["bio/tool"])
+
+    _write_map(
+        os.path.join(tmp, "map.csv"),
+        [
+            ("tool", "https://github.com/Bio/Tool"),
+            ("quiet", "https://github.com/bio/quiet"),
+            ("absent", "https://github.com/no/events"),
+            ("none", ""),
+        ],
+    )
+    _run(
+        "gharchive_metrics.py", archives,
+        "--input", "map.csv", "--output", "metrics.csv", "--workers", "2",
+        cwd=tmp,
+    )
+    rows = _read_rows(os.path.join(tmp, "metrics.csv"))
+    tool = rows.get("tool") or {}
+    for column, want in [
+        ("repo.stargazers_count", "1"),
+        ("repo.forks_count", "1"),
+        ("num_commits", "5"),  # distinct_size 3, then size 2
+        ("num_contributors", "2"),  # case-folded, non-distinct dropped
+        ("num_releases", "1"),
+        ("num_pulls", "1"),
+        ("repo.open_issues_count", "0"),
+        ("avg_time_to_close_days", "3.0"),  # (2 + 4) / 2
+        ("repo.subscribers_count", ""),
+        ("events_from", "2025-01-01T15:00:00Z"),
+        ("events_until", "2025-01-01T16:59:59Z"),
+    ]:
+        c.expect(f"tool {column}", tool.get(column), want)
+    quiet = rows.get("quiet") or {}
+    c.expect("quiet num_contributors", quiet.get("num_contributors"), "0")  # zero, not unknown
+    c.expect("quiet num_commits", quiet.get("num_commits"), "0")
+    c.expect("repository without events", (rows.get("absent") or {}).get("num_commits"), "")
+    c.expect("tool without a repository", (rows.get("none") or {}).get("owner"), "")
+    return c
+
+
+# -----------------------------
+# Git history engine (git_history_metrics.py)
+# -----------------------------
+def _git(*args: str, cwd: str, env: dict = None) -> str:
+    r = subprocess.run(
+        ["git", *args], cwd=cwd, env=dict(os.environ, **(env or {})),
+        capture_output=True, text=True, check=True,
+    )
+    return r.stdout
+
+
+def _commit(repo: str, author: str, ts: float):
+    stamp = f"@{int(ts)} +0000"
+    name = author.split("@")[0]
+    with open(os.path.join(repo, "log.txt"), "a", encoding="utf-8") as f:
+        f.write(f"{author} {stamp}\n")
+    _git("add", "log.txt", cwd=repo)
+    _git(
+        "commit", "--quiet", "-m", f"change by {name}",
+        cwd=repo,
+        env={
+            "GIT_AUTHOR_NAME": name,
+            "GIT_AUTHOR_EMAIL": author,
+            "GIT_AUTHOR_DATE": stamp,
+            "GIT_COMMITTER_NAME": name,
+            "GIT_COMMITTER_EMAIL": author,
+            "GIT_COMMITTER_DATE": stamp,
+        },
+    )
+
+
+def make_git_fixture(root: str, owner: str, repo: str) -> str:
+    """A non-bare repository at root/owner/repo that serves partial clones."""
+    path = os.path.join(root, owner, repo)
+    os.makedirs(path)
+    _git("init", "--quiet", "--initial-branch=main", cwd=path)
+    _git("config", "uploadpack.allowFilter", "true", cwd=path)
+    return path
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(int(ts), timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def check_git_history(tmp: str) -> Check:
+    c = Check("git_history")
+    day = 86400
+    now = time.time()
+    # file:// paths are case-sensitive, so the fixture keeps the map's spelling
+    origin = make_git_fixture(os.path.join(tmp, "origin"), "Bio", "Tool")
+    _commit(origin, "ann@example.org", now - 400 * day)
+    _commit(origin, "bob@example.org", now - 20 * day)
+    _commit(origin, "Ann@Example.org", now - 10 * day)
+
+    _write_map(
+        os.path.join(tmp, "map.csv"),
+        [("tool", "https://github.com/Bio/Tool"), ("gone", "https://github.com/no/such")],
+    )
+    run = (
+        "git_history_metrics.py",
+        "--input", "map.csv", "--output", "history.csv", "--mirrors", "mirrors",
+        "--url-template", "file://" + os.path.join(tmp, "origin", "{owner}", "{repo}"),
+        "--workers", "2",
+    )
+
+    # first run clones a blob-less mirror
+    _run(*run, cwd=tmp)
+    mirror = os.path.join(tmp, "mirrors", "bio", "tool.git")
+    c.expect("mirror is bare", _git("rev-parse", "--is-bare-repository", cwd=mirror).strip(), "true")
+    c.expect(
+        "mirror filter",
+        _git("config", "remote.origin.partialclonefilter", cwd=mirror).strip(),
+        "blob:none",
+    )
+    rows = _read_rows(os.path.join(tmp, "history.csv"))
+    tool = rows.get("tool") or {}
+    for column, want in [
+        ("num_commits", "3"),
+        ("num_contributors", "2"),  # emails are case-folded
+        ("first_commit_at", _iso(now - 400 * day)),
+        ("last_commit_at", _iso(now - 10 * day)),
+        ("commits_last_year", "2"),
+        ("mean_days_between_commits", "195.0"),
+    ]:
+        c.expect(f"clone {column}", tool.get(column), want)
+    c.expect("unreachable repository", (rows.get("gone") or {}).get("num_commits"), "")
+
+    # second run fetches the new commit into the same mirror
+    _commit(origin, "cy@example.org", now - day)
+    _run(*run, cwd=tmp)
+    tool = _read_rows(os.path.join(tmp, "history.csv")).get("tool") or {}
+    for column, want in [
+        ("num_commits", "4"),
+        ("num_contributors", "3"),
+        ("last_commit_at", _iso(now - day)),
+        ("commits_last_year", "3"),
+    ]:
+        c.expect(f"fetch {column}", tool.get(column), want)
+    return c
+
+
+# -----------------------------
+# SQLite store round trip (store.py)
+# -----------------------------
+def check_store(tmp: str) -> Check:
+    from fetch_GitHub_metrics import OUT_FIELDS
+
+    c = Check("store")
+    _write_map(
+        os.path.join(tmp, "map.csv"),
+        [
+            ("first", "https://github.com/Shared/Repo"),
+            ("second", "https://github.com/shared/repo"),
+            ("gone", "https://github.com/old/repo"),
+        ],
+    )
+    # two tools share one repository, each row missing what the other has
+    with open(os.path.join(tmp, "metrics.csv"), "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=OUT_FIELDS)
+        w.writeheader()
+        w.writerow({"biotoolsID": "first", "owner": "Shared", "repo": "Repo",
+                    "repo.stargazers_count": 5, "num_contributors": 7})
+        w.writerow({"biotoolsID": "second", "owner": "shared", "repo": "repo",
+                    "repo.stargazers_count": 5, "repo.network_count": 16})
+        w.writerow({"biotoolsID": "gone", "owner": "old", "repo": "repo",
+                    "repo.stargazers_count": 2, "repo.archived": "True"})
+
+    db = os.path.join(tmp, "store.db")
+    _run(
+        "store.py", "--db", db, "load-csv", "--map-csv", "map.csv",
+        "--metrics-csv", "metrics.csv", "--taken-at", "2025-01-01T00:00:00+00:00",
+        cwd=tmp,
+    )
+    _run("store.py", "--db", db, "export", "biotools_with_metrics", "--dir", "out", cwd=tmp)
+    rows = _read_rows(os.path.join(tmp, "out", "biotools_with_metrics.csv"))
+    for tool in ("first", "second"):
+        row = rows.get(tool) or {}
+        c.expect(f"{tool} stars", row.get("repo.stargazers_count"), "5")
+        c.expect(f"{tool} contributors", row.get("num_contributors"), "7")
+        c.expect(f"{tool} network", row.get("repo.network_count"), "16")
+    c.expect("gone stars before the 404", (rows.get("gone") or {}).get("repo.stargazers_count"), "2")
+
+    # a later run: a failed harvest must not hide the snapshot, a 404 must
+    import store
+
+    conn = store.connect(db)
+    store.upsert_metrics(conn, [{"owner": "shared", "repo": "repo"}], "api", "2025-02-01T00:00:00+00:00")
+    store.upsert_repositories(conn, [{"owner": "old", "repo": "repo", "canonical": "old/repo", "archived": True, "missing": True}])
+    rows = {r["biotoolsID"]: r for r in store.iter_view(conn, "biotools_with_metrics")}
+    conn.close()
+    c.expect("shared stars after a failed run", rows["first"]["repo.stargazers_count"], 5)
+    c.expect("missing repository stars", rows["gone"]["repo.stargazers_count"], None)
+    c.expect("missing repository archived", rows["gone"]["repo.archived"], "True")
+    return c
+
+
+# -----------------------------
+# Search discovery (discover_repositories.py)
+# -----------------------------
+def check_discovery(tmp: str) -> Check:
+    from mock_api_server import MockConfig, MockServer
+    from fetch_biotools_IDs_and_GitHub_URLs import extract_github_urls
+    from repo_overlap import RepoIndex
+    import store
+
+    c = Check("discovery")
+    query, cap = "topic:bioinformatics", 50
+    server = MockServer(
+        MockConfig(scale=0.005, search_cap=cap, rate_limits={"search": 100_000})
+    ).start()
+    try:
+        _write_map(
+            os.path.join(tmp, "map.csv"),
+            [(tl["biotoolsID"], ";".join(extract_github_urls(tl))) for tl in server.world.tools],
+        )
+        out = _run(
+            "discover_repositories.py",
+            "--query", query, "--since", "2008-01-01", "--until", "2025-12-31",
+            "--search-cap", str(cap), "--map-csv", "map.csv", "--db", "store.db",
+            "--output", "candidates.csv", "--metrics", "candidates_metrics.csv",
+            "--cache", "cache.json",
+            cwd=tmp,
+            env={"GITHUB_API_URL": server.url, "GITHUB_TOKENS": "fixture-token-0001"},
+        )
+        # what the registry lists, against everything the mock would find
+        registered = set(RepoIndex.from_map_csv(os.path.join(tmp, "map.csv")))
+        found = server.world.search(query)
+        matching = {
+            r["full_name"].lower()
+            for r in found
+            if "2008-01-01" <= r["created_at"] <= "2025-12-31T23:59:59Z"
+        }
+    finally:
+        server.shutdown()
+
+    c.expect("search had to be refined", len(matching) > cap and "refined" in out, True)
+    with open(os.path.join(tmp, "candidates.csv"), newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    names = [r["full_name"].lower() for r in rows]
+    c.expect("candidates listed once each", len(names), len(set(names)))
+    c.expect("candidates", set(names), matching - registered)
+    with open(os.path.join(tmp, "candidates_metrics.csv"), newline="", encoding="utf-8") as f:
+        metrics = list(csv.DictReader(f))
+    c.expect("harvested rows, in candidate order", [f"{m['owner']}/{m['repo']}".lower() for m in metrics], names)
+
+    conn = store.connect(os.path.join(tmp, "store.db"))
+    exported = list(store.iter_view(conn, "github_candidates_with_metrics"))
+    conn.close()
+    c.expect("candidates in the store view", len(exported), len(names))
+    c.expect(
+        "store view has metrics",
+        sum(r["repo.stargazers_count"] is not None for r in exported),
+        sum(m["repo.stargazers_count"] != "" for m in metrics),
+    )
+    return c
+
+
+CHECKS = {
+    "gharchive": check_gharchive,
+    "git_history": check_git_history,
+    "store": check_store,
+    "discovery": check_discovery,
+}
+
+
+# --------- Main ----------
+def main():
+    ap = argparse.ArgumentParser(
+        description="Run the offline metric engines on small generated fixtures and check their output."
+    )
+    ap.add_argument("--only", help="comma-separated check names")
+    ap.add_argument("--keep", action="store_true", help="keep the fixture directories")
+    args = ap.parse_args()
+
+    names = [n.strip() for n in args.only.split(",")] if args.only else list(CHECKS)
+    failed = 0
+    for name in names:
+        tmp = tempfile.mkdtemp(prefix=f"fixture-{name}-")
+        try:
+            c = CHECKS[name](tmp)
+        except Exception as e:
+            c = Check(name)
+            c.failures.append(f"{type(e).__name__}: {e}")
+        print(f"{name:<12} {'ok' if not c.failures else 'FAILED'}")
+        for failure in c.failures:
+            print(f"  {failure}")
+        failed += bool(c.failures)
+        if args.keep:
+            print(f"  fixture kept in {tmp}")
+        else:
+            shutil.rmtree(tmp, ignore_errors=True)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
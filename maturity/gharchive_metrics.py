@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+import os
+import re
+import csv
+import sys
+import glob
+import gzip
+import json
+import argparse
+import typing as t
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from repo_overlap import RepoIndex
+from fetch_GitHub_metrics import INPUT_CSV, METRIC_FIELDS, OUT_FIELDS, row_target
+
+# --------- Input/Output ----------
+ARCHIVE_DIR = "gharchive"  # hourly files, e.g. gharchive/2025-01-01-15.json.gz
+OUTPUT_CSV = "biotools_with_metrics_gharchive.csv"
+
+# Counts cover only the scanned window, not a repository's lifetime: stars
+# are stars given in the window, open issues are opened minus closed in it.
+# The window is written alongside (from the hourly file names, else from
+# the events), so the rows are not mistaken for API totals.
+WINDOW_FIELDS = ["events_from", "events_until"]
+GHARCHIVE_FIELDS = [*OUT_FIELDS, *WINDOW_FIELDS]
+_HOUR_FILE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})-(\d{1,2})\.json\.gz$")
+
+# GH Archive writes "repo":{"id":..,"name":"owner/repo",..} in a fixed key
+# order, so the repository can be read off the raw line before parsing JSON.
+_REPO_NAME_RE = re.compile(rb'"repo":\{"id":\d+,"name":"([^"]+)"')
+
+
+# --------- Per-repository aggregate ----------
+def new_counts() -> dict:
+    return {
+        "stars": 0,
+        "forks": 0,
+        "releases": 0,
+        "pulls": 0,
+        "issues_opened": 0,
+        "issues_closed": 0,
+        "commits": 0,
+        "authors": set(),
+        "close_days_sum": 0.0,
+        "close_days_n": 0,
+        "last_event_at": "",
+    }
+
+
+def merge_counts(into: dict, other: dict):
+    for k, v in other.items():
+        if k == "authors":
+            into[k] |= v
+        elif k == "last_event_at":
+            into[k] = max(into[k], v)
+        else:
+            into[k] += v
+
+
+def _days_between(created: t.Optional[str], closed: t.Optional[str]) -> t.Optional[float]:
+    if not created or not closed:
+        return None
+    try:
+        t0 = datetime.fromisoformat(created.replace("Z", "+00:00"))
+        t1 = datetime.fromisoformat(closed.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    dt = (t1 - t0).total_seconds() / 86400.0
+    return dt if dt >= 0 else None
+
+
+def apply_event(c: dict, event: dict):
+    """Fold one GH Archive event into a repository's counters."""
+    kind = event.get("type")
+    payload = event.get("payload") or {}
+    action = payload.get("action")
+
+    if kind == "WatchEvent":  # starring
+        c["stars"] += 1
+    elif kind == "ForkEvent":
+        c["forks"] += 1
+    elif kind == "ReleaseEvent" and action == "published":
+        c["releases"] += 1
+    elif kind == "PullRequestEvent" and action == "opened":
+        c["pulls"] += 1
+    elif kind == "IssuesEvent":
+        issue = payload.get("issue") or {}
+        if action in ("opened", "reopened"):
+            c["issues_opened"] += 1
+        elif action == "closed":
+            c["issues_closed"] += 1
+            days = _days_between(issue.get("created_at"), issue.get("closed_at"))
+            if days is not None:
+                c["close_days_sum"] += days
+                c["close_days_n"] += 1
+    elif kind == "PushEvent":
+        # newer archives may omit the commit list; fall back to the size fields
+        commits = payload.get("commits") or []
+        c["commits"] += payload.get("distinct_size", payload.get("size", len(commits)))
+        for commit in commits:
+            email = (commit.get("author") or {}).get("email")
+            if email and commit.get("distinct", True):
+                c["authors"].add(email.lower())
+
+    created = event.get("created_at") or ""
+    if created > c["last_event_at"]:
+        c["last_event_at"] = created
+
+
+# --------- Worker ----------
+_INDEX: t.Optional[RepoIndex] = None
+
+
+def _init_worker(keys: list[str]):
+    global _INDEX
+    _INDEX = RepoIndex(keys)
+
+
+def scan_archive(path: str) -> tuple[str, int, dict[str, dict]]:
+    """Stream one .json.gz archive; return (path, events kept, per-repo counters)."""
+    counts: dict[str, dict] = {}
+    kept = 0
+    with gzip.open(path, "rb") as f:
+        for line in f:
+            m = _REPO_NAME_RE.search(line)
+            if m:
+                key = m.group(1).decode("utf-8", "replace").lower()
+                if key not in _INDEX:
+                    continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if not m:
+                key = ((event.get("repo") or {}).get("name") or "").lower()
+                if key not in _INDEX:
+                    continue
+            apply_event(counts.setdefault(key, new_counts()), event)
+            kept += 1
+    return path, kept, counts
+
+
+def scan_archives(
+    paths: list[str], keys: list[str], workers: t.Optional[int] = None
+) -> dict[str, dict]:
+    """Scan archives across a process pool and merge the per-repo counters."""
+    totals: dict[str, dict] = {}
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(keys,)
+    ) as pool:
+        futures = [pool.submit(scan_archive, p) for p in paths]
+        for n, fut in enumerate(as_completed(futures), 1):
+            path, kept, counts = fut.result()
+            for key, c in counts.items():
+                merge_counts(totals.setdefault(key, new_counts()), c)
+            sys.stderr.write(f"[{n}/{len(paths)}] {os.path.basename(path)}: {kept} events\n")
+    return totals
+
+
+def counts_to_metrics(c: t.Optional[dict]) -> dict:
+    """
+    Map counters onto the biotools_with_metrics.csv columns. Values count
+    events inside the scanned window; fields the event stream cannot
+    provide (subscribers, network, archived) stay None.
+    """
+    if c is None:
+        return {k: None for k in METRIC_FIELDS}
+    avg_close = c["close_days_sum"] / c["close_days_n"] if c["close_days_n"] else None
+    return {
+        "repo.stargazers_count": c["stars"],
+        "repo.watchers_count": c["stars"],
+        "repo.subscribers_count": None,
+        "repo.forks_count": c["forks"],
+        "repo.open_issues_count": max(0, c["issues_opened"] - c["issues_closed"]),
+        "repo.network_count": None,
+        "num_contributors": len(c["authors"]),
+        "num_releases": c["releases"],
+        "num_commits": c["commits"],
+        "num_pulls": c["pulls"],
+        "avg_time_to_close_days": round(avg_close, 3) if avg_close is not None else None,
+        "repo.archived": None,
+    }
+
+
+def archive_window(paths: list[str], totals: dict[str, dict]) -> dict:
+    """events_from/events_until of the scan: hours named by the files, else event times."""
+    hours = [_HOUR_FILE_RE.search(os.path.basename(p)) for p in paths]
+    if hours and all(hours):
+        starts = sorted(
+            datetime.strptime(f"{m.group(1)} {int(m.group(2)):02d}", "%Y-%m-%d %H")
+            for m in hours
+        )
+        return {
+            "events_from": starts[0].strftime("%Y-%m-%dT%H:00:00Z"),
+            "events_until": starts[-1].strftime("%Y-%m-%dT%H:59:59Z"),
+        }
+    seen = [c["last_event_at"] for c in totals.values() if c["last_event_at"]]
+    return {"events_from": None, "events_until": max(seen) if seen else None}
+
+
+def expand_paths(specs: list[str]) -> list[str]:
+    paths = []
+    for spec in specs:
+        if os.path.isdir(spec):
+            paths.extend(sorted(glob.glob(os.path.join(spec, "*.json.gz"))))
+        else:
+            paths.extend(sorted(glob.glob(spec)) or [spec])
+    return paths
+
+
+# --------- Main pipeline ----------
+def main():
+    ap = argparse.ArgumentParser(
+        description="Repository metrics from local GH Archive hourly dumps. Counts cover "
+        "only the scanned window (events_from..events_until), unlike the API's lifetime totals."
+    )
+    ap.add_argument("archives", nargs="*", default=[ARCHIVE_DIR], help="files, globs or dirs")
+    ap.add_argument("--input", help=f"map CSV (default: {INPUT_CSV}, or the --db store)")
+    ap.add_argument(
+        "--output",
+        default=OUTPUT_CSV,
+        help="biotools_with_metrics.csv columns (window counts) plus events_from/events_until",
+    )
+    ap.add_argument("--workers", type=int, default=None, help="default: CPU count")
+    ap.add_argument(
+        "--db",
+        help="SQLite store (store.py): read the map from it unless --input is given "
+        "and upsert a 'gharchive' metrics snapshot, taken at the end of the window",
+    )
+    args = ap.parse_args()
+
+    db = None
+    if args.db:
+        import store
+
+        db = store.connect(args.db)
+    if db is not None and not args.input:
+        targets = [row_target(row) for row in store.iter_map_rows(db)]
+    else:
+        with open(args.input or INPUT_CSV, newline="", encoding="utf-8") as f:
+            targets = [row_target(row) for row in csv.DictReader(f)]
+    keys = sorted({f"{p[0]}/{p[1]}".lower() for _, _, p in targets if p})
+
+    paths = expand_paths(args.archives)
+    if not paths:
+        sys.stderr.write("ERROR: no GH Archive files found.\n")
+        sys.exit(1)
+    taken_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    totals = scan_archives(paths, keys, args.workers)
+
+    window = archive_window(paths, totals)
+
+    with open(args.output, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=GHARCHIVE_FIELDS)
+        w.writeheader()
+        for biotools_id, url, parsed in targets:
+            if not parsed:
+                w.writerow({"biotoolsID": biotools_id, "repo_url": url or None})
+                continue
+            owner, repo = parsed
+            metrics = counts_to_metrics(totals.get(f"{owner}/{repo}".lower()))
+            w.writerow(
+                {
+                    "biotoolsID": biotools_id,
+                    "owner": owner,
+                    "repo": repo,
+                    "repo_url": url,
+                    **metrics,
+                    **window,
+                }
+            )
+
+    if db is not None:
+        # keys are lowercase; the store compares owner/repo case-insensitively
+        rows = []
+        for key, c in totals.items():
+            owner, repo = key.split("/", 1)
+            rows.append({"owner": owner, "repo": repo, **counts_to_metrics(c)})
+        # the snapshot is as of the window's end, not of this run
+        for batch in store.batched(rows):
+            store.upsert_metrics(db, batch, "gharchive", window["events_until"] or taken_at)
+        db.close()
+        print(f"Updated: {args.db}")
+
+    print(f"Scanned {len(paths)} archives; {len(totals):,} repositories had events")
+    print(f"Wrote: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+import os
+import csv
+import sys
+import time
+import argparse
+import subprocess
+import typing as t
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+from fetch_GitHub_metrics import INPUT_CSV, row_target
+
+# --------- Input/Output ----------
+MIRROR_DIR = "git_mirrors"  # blob-less bare mirrors, one per owner/repo
+OUTPUT_CSV = "biotools_git_history.csv"
+URL_TEMPLATE = "https://github.com/{owner}/{repo}.git"
+
+HISTORY_FIELDS = [
+    "num_commits",
+    "num_contributors",
+    "first_commit_at",
+    "last_commit_at",
+    "commits_last_year",
+    "active_weeks_last_year",
+    "mean_days_between_commits",
+]
+OUT_FIELDS = ["biotoolsID", "owner", "repo", "repo_url", *HISTORY_FIELDS]
+
+# only branches and tags: GitHub also advertises refs/pull/*, which we never need
+FETCH_REFSPECS = ["+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*"]
+GIT_TIMEOUT = 1800  # seconds for a single clone/fetch
+_GIT_ENV = dict(os.environ, GIT_TERMINAL_PROMPT="0")  # fail, don't prompt, on 404s
+
+
+# --------- Git helpers ----------
+def _git(*args: str, cwd: t.Optional[str] = None) -> str:
+    r = subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        env=_GIT_ENV,
+        capture_output=True,
+        text=True,
+        timeout=GIT_TIMEOUT,
+    )
+    if r.returncode != 0:
+        raise RuntimeError(f"git {args[0]} -> {r.returncode}: {r.stderr.strip()[:200]}")
+    return r.stdout
+
+
+def mirror_path(mirror_dir: str, owner: str, repo: str) -> str:
+    return os.path.join(mirror_dir, owner.lower(), repo.lower() + ".git")
+
+
+def sync_mirror(url: str, path: str) -> str:
+    """Create the blob-less bare mirror on first use, fetch incrementally after."""
+    if os.path.isdir(path):
+        _git("fetch", "--prune", "--quiet", "origin", *FETCH_REFSPECS, cwd=path)
+        return "fetched"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _git("clone", "--bare", "--filter=blob:none", "--quiet", url, path)
+    return "cloned"
+
+
+# --------- History metrics ----------
+def history_metrics(path: str, as_of: float) -> dict:
+    """Commit counts, distinct authors and cadence of the default branch (HEAD)."""
+    out = _git("log", "--format=%ae%x09%at", "HEAD", cwd=path)
+    authors = set()
+    stamps = []
+    for line in out.splitlines():
+        email, _, ts = line.partition("\t")
+        authors.add(email.strip().lower())
+        stamps.append(int(ts))
+    if not stamps:
+        return {k: None for k in HISTORY_FIELDS}
+
+    stamps.sort()
+    year_ago = as_of - 365 * 86400
+    recent = [s for s in stamps if s >= year_ago]
+    span_days = (stamps[-1] - stamps[0]) / 86400.0
+
+    def iso(ts):
+        return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    return {
+        "num_commits": len(stamps),
+        "num_contributors": len(authors),
+        "first_commit_at": iso(stamps[0]),
+        "last_commit_at": iso(stamps[-1]),
+        "commits_last_year": len(recent),
+        "active_weeks_last_year": len({int((s - year_ago) // (7 * 86400)) for s in recent}),
+        "mean_days_between_commits": (
+            round(span_days / (len(stamps) - 1), 3) if len(stamps) > 1 else None
+        ),
+    }
+
+
+def process_repo(owner: str, repo: str, url: str, mirror_dir: str, as_of: float):
+    """Worker: sync one mirror and compute its metrics; returns (key, metrics, error)."""
+    key = f"{owner}/{repo}".lower()
+    try:
+        sync_mirror(url, mirror_path(mirror_dir, owner, repo))
+        return key, history_metrics(mirror_path(mirror_dir, owner, repo), as_of), None
+    except (RuntimeError, subprocess.TimeoutExpired) as e:
+        return key, None, str(e)
+
+
+def collect_history(
+    repos: list[tuple[str, str]],
+    mirror_dir: str = MIRROR_DIR,
+    url_template: str = URL_TEMPLATE,
+    workers: t.Optional[int] = None,
+    as_of: t.Optional[float] = None,
+) -> dict[str, dict]:
+    """Sync and measure many repositories in a process pool; keyed by lowercase owner/repo."""
+    as_of = time.time() if as_of is None else as_of
+    results: dict[str, dict] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                process_repo,
+                owner,
+                repo,
+                url_template.format(owner=owner, repo=repo),
+                mirror_dir,
+                as_of,
+            )
+            for owner, repo in repos
+        ]
+        for fut in as_completed(futures):
+            key, metrics, error = fut.result()
+            if error:
+                sys.stderr.write(f"[WARN] {key}: {error}\n")
+            else:
+                results[key] = metrics
+    return results
+
+
+# --------- Main pipeline ----------
+def main():
+    ap = argparse.ArgumentParser(
+        description="Commit history metrics from local blob-less bare mirrors."
+    )
+    ap.add_argument("--input", default=INPUT_CSV)
+    ap.add_argument("--output", default=OUTPUT_CSV)
+    ap.add_argument("--mirrors", default=MIRROR_DIR)
+    ap.add_argument(
+        "--url-template",
+        default=URL_TEMPLATE,
+        help="clone URL with {owner} and {repo}, e.g. file:///fixtures/{owner}/{repo}",
+    )
+    ap.add_argument("--workers", type=int, default=None, help="default: CPU count")
+    args = ap.parse_args()
+
+    with open(args.input, newline="", encoding="utf-8") as f:
+        targets = [row_target(row) for row in csv.DictReader(f)]
+
+    # one mirror per repository, however many tools point at it
+    unique = {}
+    for _, _, parsed in targets:
+        if parsed:
+            unique.setdefault(f"{parsed[0]}/{parsed[1]}".lower(), tuple(parsed))
+    results = collect_history(
+        list(unique.values()), args.mirrors, args.url_template, args.workers
+    )
+
+    with open(args.output, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=OUT_FIELDS)
+        w.writeheader()
+        for biotools_id, url, parsed in targets:
+            if not parsed:
+                w.writerow({"biotoolsID": biotools_id, "repo_url": url or None})
+                continue
+            owner, repo = parsed
+            w.writerow(
+                {
+                    "biotoolsID": biotools_id,
+                    "owner": owner,
+                    "repo": repo,
+                    "repo_url": url,
+                    **(results.get(f"{owner}/{repo}".lower()) or {}),
+                }
+            )
+
+    print(f"Measured {len(results):,} of {len(unique):,} repositories")
+    print(f"Wrote: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
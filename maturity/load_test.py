@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+import os
+import json
+import time
+import types
+import argparse
+import tempfile
+import threading
+import typing as t
+import urllib.error
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from mock_api_server import MockServer, add_config_arguments, config_from_args
+
+# --------- Config ----------
+STAGES = ["biotools", "maturity", "metrics"]
+DEFAULT_WORKERS = 8
+PAGE_RETRIES = 5  # failed /api/tool/ pages retried before the biotools stage gives up
+
+
+class StageStats:
+    """Wall time, per-call latencies and error count of one stage run."""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.errors = 0
+        self.latencies: list[float] = []
+        self.statuses: Counter = Counter()  # HTTP status per call, where the stage sees it
+        self.wall = 0.0
+        self.tokens: t.Optional[list[dict]] = None  # per-token usage, GitHub stages
+        self._lock = threading.Lock()
+
+    def add(self, latency: float, ok: bool = True, items: int = 1, status: t.Optional[int] = None):
+        with self._lock:
+            self.latencies.append(latency)
+            self.items += items
+            if status is not None:
+                self.statuses[status] += 1
+            if not ok:
+                self.errors += 1
+
+    def summary(self) -> dict:
+        lat = sorted(self.latencies)
+
+        def pct(p):
+            return lat[min(len(lat) - 1, int(p / 100 * len(lat)))] * 1000 if lat else None
+
+        return {
+            "stage": self.name,
+            "workers": self.workers,
+            "items": self.items,
+            "calls": len(lat),
+            "errors": self.errors,
+            "statuses": dict(sorted(self.statuses.items())),
+            "wall_s": round(self.wall, 3),
+            "items_per_s": round(self.items / self.wall, 1) if self.wall else None,
+            "p50_ms": pct(50),
+            "p95_ms": pct(95),
+            "p99_ms": pct(99),
+            "max_ms": lat[-1] * 1000 if lat else None,
+            "tokens": self.tokens,
+        }
+
+
+# -----------------------------
+# Stages
+# -----------------------------
+def stage_biotools(server: MockServer, workers: int, tokens: int = 1) -> StageStats:
+    """Page through /api/tool/ with BiotoolsIterator (sequential by design)."""
+    import fetch_biotools_IDs_and_GitHub_URLs as fb
+
+    fb.BIOTOOLS_API_URL = server.url + "/api/tool/"
+    stats = StageStats("biotools", 1)
+    it = fb.BiotoolsIterator()
+    get_page = it.get_page
+
+    def timed_page():
+        for attempt in range(PAGE_RETRIES + 1):
+            t0 = time.perf_counter()
+            try:
+                page = get_page()
+            except urllib.error.HTTPError as e:
+                # urlopen raises on 4xx/5xx; count the failure and retry the same page
+                stats.add(time.perf_counter() - t0, False, items=0, status=e.code)
+                if attempt == PAGE_RETRIES:
+                    raise
+                time.sleep(float(e.headers.get("Retry-After") or 0))
+                continue
+            stats.add(time.perf_counter() - t0, page is not None, items=0, status=200)
+            return page
+
+    it.get_page = timed_page
+    t0 = time.perf_counter()
+    for _ in it:
+        stats.items += 1
+    stats.wall = time.perf_counter() - t0
+    return stats
+
+
+def stage_maturity(server: MockServer, workers: int, tokens: int = 1) -> StageStats:
+    """
+    fetch_maturity on a thread pool. It maps every failure to "None", so the
+    HTTP status is read off a wrapper around the requests.get it calls.
+    """
+    import requests
+    import fetch_biotools_maturity as fm
+
+    seen = threading.local()
+
+    def get(*args, **kwargs):
+        seen.status = None  # connection errors leave no status
+        r = requests.get(*args, **kwargs)
+        seen.status = r.status_code
+        return r
+
+    def timed(biotools_id):
+        seen.status = None
+        t0 = time.perf_counter()
+        fm.fetch_maturity(biotools_id)
+        stats.add(time.perf_counter() - t0, seen.status == 200, status=seen.status)
+
+    stats = StageStats("maturity", workers)
+    ids = [tool["biotoolsID"] for tool in server.world.tools]
+    saved = fm.BASE_URL, fm.requests
+    fm.BASE_URL, fm.requests = server.url + "/api/tool", types.SimpleNamespace(get=get)
+    try:
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(timed, ids))
+        stats.wall = time.perf_counter() - t0
+    finally:
+        fm.BASE_URL, fm.requests = saved
+    return stats
+
+
+def stage_metrics(server: MockServer, workers: int, tokens: int = 1) -> StageStats:
+    """
+    fetch_GitHub_metrics.harvest_rows, the harvester's own worker pool, over
+    every tool with a repository. harvest_row logs and swallows failures, so
+    a row counts as an error when its last collect_metrics call raised.
+    """
+    import fetch_GitHub_metrics as fg
+    from fetch_biotools_IDs_and_GitHub_URLs import extract_github_urls
+    from repo_cache import RepoCache
+    from token_pool import TokenPool
+
+    fg.REST_URL = server.url
+    fg.GRAPHQL_URL = server.url + "/graphql"
+    fg.POOL = TokenPool(f"load-test-token-{i:04d}" for i in range(tokens))
+    # fresh and never saved: every run sees every repository
+    fg.CACHE = RepoCache(os.path.join(tempfile.mkdtemp(prefix="load-test-"), "cache.json"))
+
+    rows = []
+    for tool in server.world.tools:
+        row = {"biotoolsID": tool["biotoolsID"], "github_urls": ";".join(extract_github_urls(tool))}
+        if fg.row_target(row)[2]:
+            rows.append(row)
+
+    stats = StageStats("metrics", workers)
+    seen = threading.local()
+    collect_metrics, harvest_row = fg.collect_metrics, fg.harvest_row
+
+    def tracked_collect(*args, **kwargs):
+        seen.ok = False
+        metrics = collect_metrics(*args, **kwargs)
+        seen.ok = True
+        return metrics
+
+    def timed_row(row):
+        seen.ok = False
+        t0 = time.perf_counter()
+        out = harvest_row(row)
+        stats.add(time.perf_counter() - t0, seen.ok)
+        return out
+
+    fg.collect_metrics, fg.harvest_row = tracked_collect, timed_row
+    try:
+        t0 = time.perf_counter()
+        for _ in fg.harvest_rows(rows, workers):
+            pass
+        stats.wall = time.perf_counter() - t0
+    finally:
+        fg.collect_metrics, fg.harvest_row = collect_metrics, harvest_row
+    stats.tokens = fg.POOL.report()
+    return stats
+
+
+STAGE_FUNCS = {
+    "biotools": stage_biotools,
+    "maturity": stage_maturity,
+    "metrics": stage_metrics,
+}
+
+
+def _ms(value) -> str:
+    return f"{value:.1f}ms" if value is not None else "-"
+
+
+# --------- Main ----------
+def main():
+    ap = argparse.ArgumentParser(
+        description="Run the fetch stages against mock_api_server and report throughput."
+    )
+    ap.add_argument("--stages", default=",".join(STAGES))
+    ap.add_argument("--workers", default=str(DEFAULT_WORKERS), help="e.g. 1,4,16")
+    ap.add_argument("--tokens", type=int, default=1, help="GitHub tokens in the pool")
+    ap.add_argument("--output", help="write the summaries as JSON")
+    add_config_arguments(ap)
+    args = ap.parse_args()
+
+    server = MockServer(config_from_args(args)).start()
+    print(
+        f"Mock server on {server.url}: {len(server.world.tools):,} tools, "
+        f"{len(server.world.repos):,} repositories"
+    )
+
+    summaries = []
+    try:
+        for name in [s.strip() for s in args.stages.split(",") if s.strip()]:
+            for workers in [int(w) for w in args.workers.split(",")]:
+                s = STAGE_FUNCS[name](server, workers, args.tokens).summary()
+                summaries.append(s)
+                rate = s["items_per_s"] if s["items_per_s"] is not None else "-"
+                print(
+                    f"{s['stage']:<9} workers={s['workers']:<3} items={s['items']:<7,} "
+                    f"errors={s['errors']:<5} {rate:>8} items/s  "
+                    + "  ".join(f"{p}={_ms(s[p + '_ms'])}" for p in ("p50", "p95", "p99"))
+                )
+                if name == "biotools":
+                    break  # the paginated iterator has no concurrency knob
+    finally:
+        server.shutdown()
+
+    print(f"Server responses by status: {dict(sorted(server.status_counts.items()))}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {"server": server.status_counts, "stages": summaries}, f, indent=2
+            )
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
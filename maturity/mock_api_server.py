@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+import re
+import json
+import time
+import random
+import argparse
+import threading
+import typing as t
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import synthetic_data
+from repo_overlap import repo_key
+from fetch_biotools_IDs_and_GitHub_URLs import extract_github_urls
+
+# --------- Defaults ----------
+HOST = "127.0.0.1"
+PORT = 8765
+PAGE_SIZE = 10  # bio.tools /api/tool/ page size
+# per token per window; bio.tools calls are anonymous, so theirs is shared
+RATE_LIMITS = {"core": 5000, "graphql": 5000, "search": 30, "biotools": 100_000}
+RATE_WINDOW = 3600  # seconds
+SEARCH_WINDOW = 60  # search budgets reset every minute
+SEARCH_CAP = 1000  # results reachable through search pagination
+
+
+class MockConfig:
+    """Knobs of the stand-in server; all latencies are in seconds."""
+
+    def __init__(
+        self,
+        scale: float = 0.01,
+        seed: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        page_size: int = PAGE_SIZE,
+        rate_limits: t.Optional[dict] = None,
+        rate_window: float = RATE_WINDOW,
+        error_403: float = 0.0,
+        error_429: float = 0.0,
+        renamed: float = 0.02,
+        missing: float = 0.03,
+        archived: float = 0.05,
+        unregistered: float = 4.0,
+        search_cap: int = SEARCH_CAP,
+    ):
+        self.scale = scale
+        self.seed = seed
+        self.latency = latency
+        self.jitter = jitter
+        self.page_size = page_size
+        self.rate_limits = dict(RATE_LIMITS, **(rate_limits or {}))
+        self.rate_window = rate_window
+        self.error_403 = error_403  # injected secondary-rate-limit responses
+        self.error_429 = error_429
+        self.renamed = renamed  # fraction of repositories answering with a redirect
+        self.missing = missing  # fraction answering 404
+        self.archived = archived
+        self.unregistered = unregistered  # searchable repositories per registered one
+        self.search_cap = search_cap
+
+
+# -----------------------------
+# Synthetic world
+# -----------------------------
+class MockWorld:
+    """Tools and repositories the server answers for, derived from synthetic_data."""
+
+    def __init__(self, config: MockConfig):
+        rng = random.Random(config.seed)
+        self.tools = list(synthetic_data.iter_tools(config.scale, config.seed))
+        self.tools_by_id = {tool["biotoolsID"]: tool for tool in self.tools}
+
+        self.repos: dict[str, dict] = {}  # canonical key -> repository record
+        self.renames: dict[str, str] = {}  # old key -> canonical key
+        self.missing: set[str] = set()
+        for tool in self.tools:
+            for url in extract_github_urls(tool):
+                key = repo_key(url)
+                if not key or key in self.repos or key in self.renames:
+                    continue
+                r = rng.random()
+                if r < config.missing:
+                    self.missing.add(key)
+                    continue
+                canonical = key
+                if r < config.missing + config.renamed:
+                    canonical = key + "-renamed"
+                    self.renames[key] = canonical
+                self.repos[canonical] = self._make_repo(
+                    rng, len(self.repos) + 1, canonical, config
+                )
+
+        # search profiles, and repositories GitHub has but the registry does not;
+        # a separate generator keeps the registry world above unchanged
+        prof = random.Random(config.seed + 1)
+        for repo in self.repos.values():
+            repo.update(synthetic_data.make_repo_profile(prof, bio=True))
+        self.unregistered: set[str] = set()
+        for _ in range(int(len(self.repos) * config.unregistered)):
+            key = "/".join(synthetic_data.make_owner_repo(prof)).lower()
+            if key in self.repos or key in self.renames or key in self.missing:
+                continue
+            repo = self._make_repo(prof, len(self.repos) + 1, key, config)
+            repo.update(synthetic_data.make_repo_profile(prof, bio=prof.random() < 0.7))
+            self.repos[key] = repo
+            self.unregistered.add(key)
+        self.repos_by_id = {repo["id"]: repo for repo in self.repos.values()}
+        self.search_index = sorted(self.repos.values(), key=lambda r: (r["created_at"], r["id"]))
+
+    @staticmethod
+    def _make_repo(rng, repo_id, key, config) -> dict:
+        owner, name = key.split("/", 1)
+        metrics = synthetic_data.make_metrics(rng)
+        return {
+            "id": repo_id,
+            "full_name": key,
+            "owner": owner,
+            "name": name,
+            "archived": rng.random() < config.archived,
+            "metrics": metrics,
+            "issues_closed": synthetic_data.make_issue_nodes(
+                rng, min(100, metrics["num_pulls"] + 1)
+            ),
+        }
+
+    def search(self, q: str) -> list[dict]:
+        """Repositories matching a search query (topic:, created: and bare keywords)."""
+        terms, topics, lo, hi = [], [], "", "\uffff"
+        for tok in q.split():
+            if tok.startswith("topic:"):
+                topics.append(tok[6:].lower())
+            elif tok.startswith("created:"):
+                lo, hi = _created_bounds(tok[8:])
+            elif ":" not in tok:
+                terms.append(tok.lower())  # other qualifiers (in:, fork:, ...) are ignored
+        found = []
+        for repo in self.search_index:
+            if not lo <= repo["created_at"] <= hi:
+                continue
+            if any(tp not in repo["topics"] for tp in topics):
+                continue
+            text = " ".join([repo["full_name"], repo["description"], *repo["topics"]]).lower()
+            if all(term in text for term in terms):
+                found.append(repo)
+        return found
+
+    def resolve(self, owner: str, name: str) -> tuple[t.Optional[dict], bool]:
+        """(repository, renamed?) for a requested owner/name."""
+        key = f"{owner}/{name}".lower()
+        if key in self.renames:
+            return self.repos[self.renames[key]], True
+        return self.repos.get(key), False
+
+
+def repo_rest_json(repo: dict) -> dict:
+    m = repo["metrics"]
+    return {
+        "id": repo["id"],
+        "name": repo["name"],
+        "full_name": repo["full_name"],
+        "owner": {"login": repo["owner"]},
+        "archived": repo["archived"],
+        "stargazers_count": m["repo.stargazers_count"],
+        "watchers_count": m["repo.watchers_count"],
+        "subscribers_count": m["repo.subscribers_count"],
+        "forks_count": m["repo.forks_count"],
+        "open_issues_count": m["repo.open_issues_count"],
+        "network_count": m["repo.network_count"],
+    }
+
+
+def repo_search_json(repo: dict) -> dict:
+    return {
+        "id": repo["id"],
+        "name": repo["name"],
+        "full_name": repo["full_name"],
+        "owner": {"login": repo["owner"]},
+        "html_url": f"https://github.com/{repo['full_name']}",
+        "description": repo["description"],
+        "topics": repo["topics"],
+        "created_at": repo["created_at"],
+        "archived": repo["archived"],
+        "fork": False,
+        "stargazers_count": repo["metrics"]["repo.stargazers_count"],
+    }
+
+
+def _created_bounds(spec: str) -> tuple[str, str]:
+    """'A..B', '>=A' or '<=B' (dates or UTC timestamps) -> comparable [lo, hi]."""
+    lo, hi = "", "*"
+    if ".." in spec:
+        lo, hi = spec.split("..", 1)
+    elif spec.startswith(">="):
+        lo = spec[2:]
+    elif spec.startswith("<="):
+        hi = spec[2:]
+    else:
+        lo = hi = spec
+    lo = "" if lo == "*" else lo if "T" in lo else lo + "T00:00:00Z"
+    hi = "\uffff" if hi == "*" else hi if "T" in hi else hi + "T23:59:59Z"
+    return lo, hi
+
+
+def repo_graphql_json(repo: dict) -> dict:
+    m = repo["metrics"]
+    return {
+        "nameWithOwner": repo["full_name"],
+        "isArchived": repo["archived"],
+        "stargazerCount": m["repo.stargazers_count"],
+        "watchers": {"totalCount": m["repo.subscribers_count"]},
+        "forkCount": m["repo.forks_count"],
+        "issues": {"totalCount": m["repo.open_issues_count"]},
+        "releases": {"totalCount": m["num_releases"]},
+        "pullRequests": {"totalCount": m["num_pulls"]},
+        "defaultBranchRef": {
+            "target": {"history": {"totalCount": m["num_commits"]}}
+        },
+        "issuesClosed": {"nodes": repo["issues_closed"]},
+    }
+
+
+def repo_metadata_json(repo: dict, query: str) -> dict:
+    """Metadata fields of a GraphQL repository, answering each object(expression:) alias in query."""
+    meta = synthetic_data.make_repo_metadata(random.Random(repo["id"]), repo["full_name"])
+    spdx = meta["license"]
+    body = {
+        "description": repo["description"],
+        "homepageUrl": None,
+        "licenseInfo": {"spdxId": spdx, "name": spdx} if spdx else None,
+        "repositoryTopics": {"nodes": [{"topic": {"name": tp}} for tp in repo["topics"]]},
+        "languages": {
+            "edges": [
+                {"size": size, "node": {"name": lang}}
+                for lang, size in sorted(meta["languages"].items(), key=lambda kv: -kv[1])
+            ]
+        },
+    }
+    for alias, path in _BLOB_RE.findall(query):
+        text = meta["files"].get(path)
+        body[alias] = {"text": text, "isTruncated": False} if text is not None else None
+    return body
+
+
+# -----------------------------
+# Rate limiting
+# -----------------------------
+class RateLimiter:
+    """Per-token, per-resource budgets that reset every `window` seconds."""
+
+    def __init__(self, limits: dict, window: float, windows: t.Optional[dict] = None):
+        self.limits = limits
+        self.window = window
+        self.windows = windows or {}  # per-resource overrides
+        self.lock = threading.Lock()
+        self.used: dict[tuple[str, str], tuple[float, int]] = {}
+
+    def take(self, token: str, resource: str) -> tuple[bool, dict]:
+        now = time.time()
+        limit = self.limits.get(resource, self.limits["core"])
+        window = self.windows.get(resource, self.window)
+        with self.lock:
+            start, used = self.used.get((token, resource), (now, 0))
+            if now - start >= window:
+                start, used = now, 0
+            ok = used < limit
+            if ok:
+                used += 1
+            self.used[(token, resource)] = (start, used)
+        headers = {
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(limit - used),
+            "X-RateLimit-Used": str(used),
+            "X-RateLimit-Reset": str(int(start + window)),
+            "X-RateLimit-Resource": resource,
+        }
+        return ok, headers
+
+
+# -----------------------------
+# HTTP handler
+# -----------------------------
+_TOOL_RE = re.compile(r"^/api/tool/([^/]+)/?$")
+_REPO_RE = re.compile(r"^/repos/([^/]+)/([^/]+)(/contributors)?/?$")
+_REPO_ID_RE = re.compile(r"^/repositories/(\d+)(/contributors)?/?$")
+_BLOB_RE = re.compile(r'(\w+):\s*object\(expression:\s*"HEAD:([^"]+)"\)')
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so clients can pool connections
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+    server: "MockServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    # --- plumbing ---
+    def _send(self, status: int, body=None, headers: t.Optional[dict] = None):
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.count(status)
+
+    def _delay(self):
+        cfg = self.server.config
+        if cfg.latency or cfg.jitter:
+            time.sleep(max(0.0, random.gauss(cfg.latency, cfg.jitter)))
+
+    def _gate(self, resource: str) -> t.Optional[dict]:
+        """
+        Apply rate limits and injected errors to GitHub and bio.tools routes
+        alike; None means a response was sent.
+        """
+        cfg = self.server.config
+        token = self.headers.get("Authorization", "anonymous")
+        ok, headers = self.server.limiter.take(token, resource)
+        if not ok:
+            self._send(403, {"message": "API rate limit exceeded"}, headers)
+            return None
+        r = random.random()
+        if r < cfg.error_403:
+            self._send(
+                403,
+                {"message": "You have exceeded a secondary rate limit."},
+                dict(headers, **{"Retry-After": "1"}),
+            )
+            return None
+        if r < cfg.error_403 + cfg.error_429:
+            self._send(429, {"message": "Too Many Requests"}, dict(headers, **{"Retry-After": "1"}))
+            return None
+        return headers
+
+    # --- routes ---
+    def do_GET(self):
+        self._delay()
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        world = self.server.world
+
+        if url.path.rstrip("/") == "/search/repositories":
+            headers = self._gate("search")
+            if headers is None:
+                return
+            return self._search(query, headers)
+
+        m = _TOOL_RE.match(url.path)
+        if m or url.path.rstrip("/") == "/api/tool":
+            headers = self._gate("biotools")
+            if headers is None:
+                return
+            if m is None:
+                return self._tool_page(int(query.get("page", 1)), headers)
+            tool = world.tools_by_id.get(m.group(1))
+            if tool is None:
+                return self._send(404, {"detail": "Not found."}, headers)
+            return self._send(200, tool, headers)
+
+        m = _REPO_ID_RE.match(url.path)
+        if m:
+            headers = self._gate("core")
+            if headers is None:
+                return
+            repo = world.repos_by_id.get(int(m.group(1)))
+            if repo is None:
+                return self._send(404, {"message": "Not Found"}, headers)
+            if m.group(2):
+                return self._contributors(repo, query, headers)
+            return self._send(200, repo_rest_json(repo), headers)
+
+        m = _REPO_RE.match(url.path)
+        if m:
+            headers = self._gate("core")
+            if headers is None:
+                return
+            repo, renamed = world.resolve(m.group(1), m.group(2))
+            if repo is None:
+                return self._send(404, {"message": "Not Found"}, headers)
+            if renamed:
+                # GitHub answers moved repositories with a redirect to /repositories/{id}
+                location = f"/repositories/{repo['id']}" + (m.group(3) or "")
+                if url.query:
+                    location += "?" + url.query
+                return self._send(
+                    301, {"message": "Moved Permanently"}, dict(headers, Location=location)
+                )
+            if m.group(3):
+                return self._contributors(repo, query, headers)
+            return self._send(200, repo_rest_json(repo), headers)
+
+        self._send(404, {"message": "Not Found"})
+
+    def do_POST(self):
+        self._delay()
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if urlsplit(self.path).path.rstrip("/") != "/graphql":
+            return self._send(404, {"message": "Not Found"})
+        headers = self._gate("graphql")
+        if headers is None:
+            return
+        variables = payload.get("variables") or {}
+        repo, _ = self.server.world.resolve(
+            variables.get("owner", ""), variables.get("name", "")
+        )
+        if repo is None:
+            name = f"{variables.get('owner')}/{variables.get('name')}"
+            return self._send(
+                200,
+                {
+                    "data": {"repository": None},
+                    "errors": [
+                        {
+                            "type": "NOT_FOUND",
+                            "message": f"Could not resolve to a Repository with the name '{name}'.",
+                        }
+                    ],
+                },
+                headers,
+            )
+        body = repo_graphql_json(repo)
+        query = payload.get("query") or ""
+        if "licenseInfo" in query:
+            body.update(repo_metadata_json(repo, query))
+        self._send(200, {"data": {"repository": body}}, headers)
+
+    def _tool_page(self, page: int, headers: dict):
+        size = self.server.config.page_size
+        tools = self.server.world.tools
+        last_page = max(1, -(-len(tools) // size))
+        if not 1 <= page <= last_page:
+            return self._send(404, {"detail": "Invalid page."}, headers)
+        body = synthetic_data.make_api_page(
+            tools[(page - 1) * size : page * size], page, last_page
+        )
+        body["count"] = len(tools)
+        self._send(200, body, headers)
+
+    def _search(self, query: dict, headers: dict):
+        cap = self.server.config.search_cap
+        per_page = min(100, max(1, int(query.get("per_page", 30))))
+        page = int(query.get("page", 1))
+        if page < 1 or (page - 1) * per_page >= cap:
+            return self._send(
+                422,
+                {"message": f"Only the first {cap} search results are available"},
+                headers,
+            )
+        found = self.server.world.search(query.get("q", ""))
+        start = (page - 1) * per_page
+        items = found[start : min(start + per_page, cap)]
+        body = {
+            "total_count": len(found),
+            "incomplete_results": False,
+            "items": [repo_search_json(r) for r in items],
+        }
+        self._send(200, body, headers)
+
+    def _contributors(self, repo: dict, query: dict, headers: dict):
+        total = repo["metrics"]["num_contributors"]
+        per_page = max(1, int(query.get("per_page", 30)))
+        page = int(query.get("page", 1))
+        last = max(1, -(-total // per_page))
+        start = (page - 1) * per_page
+        body = [
+            {"login": f"user{i}", "contributions": total - i}
+            for i in range(start, min(total, start + per_page))
+        ]
+        if last > 1:
+            base = f"{self.server.url}/repos/{repo['full_name']}/contributors"
+            rest = f"per_page={per_page}&anon={query.get('anon', '0')}"
+            links = []
+            if page < last:
+                links.append(f'<{base}?{rest}&page={page + 1}>; rel="next"')
+                links.append(f'<{base}?{rest}&page={last}>; rel="last"')
+            headers = dict(headers, Link=", ".join(links)) if links else headers
+        self._send(200, body, headers)
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, config: MockConfig, host: str = HOST, port: int = 0):
+        self.config = config
+        self.world = MockWorld(config)
+        self.limiter = RateLimiter(
+            config.rate_limits,
+            config.rate_window,
+            {"search": min(SEARCH_WINDOW, config.rate_window)},
+        )
+        self.status_counts: dict[int, int] = {}
+        self._count_lock = threading.Lock()
+        super().__init__((host, port), MockHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, status: int):
+        with self._count_lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def start(self) -> "MockServer":
+        """Serve from a daemon thread (for harnesses running in-process)."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def add_config_arguments(ap: argparse.ArgumentParser):
+    ap.add_argument("--scale", type=float, default=0.01, help="registry multiple to serve")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--latency", type=float, default=0.0, help="mean response delay (s)")
+    ap.add_argument("--jitter", type=float, default=0.0, help="delay std deviation (s)")
+    ap.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    ap.add_argument("--core-limit", type=int, default=RATE_LIMITS["core"])
+    ap.add_argument("--graphql-limit", type=int, default=RATE_LIMITS["graphql"])
+    ap.add_argument("--search-limit", type=int, default=RATE_LIMITS["search"], help="per minute")
+    ap.add_argument("--biotools-limit", type=int, default=RATE_LIMITS["biotools"])
+    ap.add_argument("--rate-window", type=float, default=RATE_WINDOW)
+    ap.add_argument("--error-403", type=float, default=0.0, help="injected 403 rate")
+    ap.add_argument("--error-429", type=float, default=0.0, help="injected 429 rate")
+    ap.add_argument("--renamed", type=float, default=0.02)
+    ap.add_argument("--missing", type=float, default=0.03)
+    ap.add_argument("--archived", type=float, default=0.05)
+    ap.add_argument("--unregistered", type=float, default=4.0, help="per registered repository")
+    ap.add_argument("--search-cap", type=int, default=SEARCH_CAP)
+
+
+def config_from_args(args) -> MockConfig:
+    return MockConfig(
+        scale=args.scale,
+        seed=args.seed,
+        latency=args.latency,
+        jitter=args.jitter,
+        page_size=args.page_size,
+        rate_limits={
+            "core": args.core_limit,
+            "graphql": args.graphql_limit,
+            "search": args.search_limit,
+            "biotools": args.biotools_limit,
+        },
+        rate_window=args.rate_window,
+        error_403=args.error_403,
+        error_429=args.error_429,
+        renamed=args.renamed,
+        missing=args.missing,
+        archived=args.archived,
+        unregistered=args.unregistered,
+        search_cap=args.search_cap,
+    )
+
+
+# --------- Main ----------
+def main():
+    ap = argparse.ArgumentParser(description="Offline stand-in for the bio.tools and GitHub APIs.")
+    ap.add_argument("--host", default=HOST)
+    ap.add_argument("--port", type=int, default=PORT)
+    add_config_arguments(ap)
+    args = ap.parse_args()
+
+    server = MockServer(config_from_args(args), args.host, args.port)
+    print(
+        f"Serving {len(server.world.tools):,} tools and {len(server.world.repos):,} "
+        f"repositories on {server.url}\n"
+        f"  BIOTOOLS_API_URL={server.url}/api/tool/\n"
+        f"  GITHUB_API_URL={server.url}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import zlib
+import argparse
+import typing as t
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# --------- Format ----------
+# A dump is a sequence of independent gzip members, each holding a block of
+# JSON Lines (one tool per line). Any gzip reader (zcat, gzip.open) sees a
+# plain .jsonl stream; the side index makes single tools and single blocks
+# addressable without inflating the rest:
+#
+#   {"format": 1,
+#    "blocks": [[file_offset, compressed_len, n_tools], ...],
+#    "ids":    {biotoolsID: [block, offset_in_block], ...}}
+#
+# fetch_GitHub_metrics.py --metadata reuses the format for repository
+# metadata bundles, keyed by lowercase owner/repo.
+DUMP_FORMAT = 1
+BLOCK_TOOLS = 1000  # tools per gzip member
+COMPRESS_LEVEL = 6
+
+
+def index_path(path: str) -> str:
+    return path + ".idx.json"
+
+
+def _gzip_block(data: bytes, level: int) -> bytes:
+    c = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    return c.compress(data) + c.flush()
+
+
+def _gunzip_block(data: bytes) -> bytes:
+    return zlib.decompress(data, 31)
+
+
+# --------- Writing ----------
+class DumpWriter:
+    """Append tools (serialized JSON, one per call) to a block-framed dump."""
+
+    def __init__(
+        self, path: str, block_tools: int = BLOCK_TOOLS, level: int = COMPRESS_LEVEL
+    ):
+        self.path = path
+        self.block_tools = block_tools
+        self.level = level
+        self.blocks: list[list[int]] = []
+        self.ids: dict[str, list[int]] = {}
+        _remove_index(path)  # the data is about to be replaced
+        self._f = open(path, "wb")
+        self._buf = bytearray()
+        self._n = 0
+
+    def write(self, tool_bytes: bytes, biotools_id: t.Optional[str] = None):
+        if biotools_id:
+            self.ids.setdefault(biotools_id, [len(self.blocks), len(self._buf)])
+        self._buf += tool_bytes.replace(b"\n", b" ")  # keep one line per tool
+        self._buf += b"\n"
+        self._n += 1
+        if self._n >= self.block_tools:
+            self._flush()
+
+    def _flush(self):
+        if not self._n:
+            return
+        data = _gzip_block(bytes(self._buf), self.level)
+        self.blocks.append([self._f.tell(), len(data), self._n])
+        self._f.write(data)
+        self._buf.clear()
+        self._n = 0
+
+    def close(self):
+        """Flush the last block, then write the index (its presence marks a complete dump)."""
+        if self._f.closed:
+            return
+        self._flush()
+        self._f.close()
+        tmp = index_path(self.path) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"format": DUMP_FORMAT, "blocks": self.blocks, "ids": self.ids}, f)
+        os.replace(tmp, index_path(self.path))
+
+    def abort(self):
+        """Close the data file without an index: readers reject the dump as incomplete."""
+        if not self._f.closed:
+            self._f.close()
+
+    def __enter__(self) -> "DumpWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def _remove_index(path: str):
+    try:
+        os.remove(index_path(path))
+    except FileNotFoundError:
+        pass
+
+
+# --------- Reading ----------
+class DumpReader:
+    """Random access and parallel scans over a dump written by DumpWriter."""
+
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            with open(index_path(path), encoding="utf-8") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            raise ValueError(f"{path}: no index, the dump is incomplete") from None
+        if index.get("format") != DUMP_FORMAT:
+            raise ValueError(f"{index_path(path)}: unsupported dump format {index.get('format')}")
+        self.blocks: list[list[int]] = index["blocks"]
+        self.ids: dict[str, list[int]] = index["ids"]
+
+    def __len__(self) -> int:
+        return sum(n for _, _, n in self.blocks)
+
+    def __contains__(self, biotools_id: str) -> bool:
+        return biotools_id in self.ids
+
+    def read_block(self, block: int) -> bytes:
+        """Decompressed JSON Lines of one block."""
+        offset, length, _ = self.blocks[block]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return _gunzip_block(f.read(length))
+
+    def get_bytes(self, biotools_id: str) -> t.Optional[bytes]:
+        loc = self.ids.get(biotools_id)
+        if loc is None:
+            return None
+        data = self.read_block(loc[0])
+        end = data.find(b"\n", loc[1])
+        return data[loc[1] : end if end >= 0 else None]
+
+    def get(self, biotools_id: str) -> t.Optional[dict]:
+        """One tool, inflating only the block that holds it."""
+        raw = self.get_bytes(biotools_id)
+        return json.loads(raw) if raw is not None else None
+
+    def iter_blocks(self, workers: int = 4) -> t.Iterator[bytes]:
+        """Decompressed blocks in file order; zlib releases the GIL, so threads overlap."""
+        if workers <= 1:
+            yield from map(self.read_block, range(len(self.blocks)))
+            return
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(self.read_block, range(len(self.blocks)))
+
+    def iter_tool_bytes(self, workers: int = 4) -> t.Iterator[bytes]:
+        for data in self.iter_blocks(workers):
+            yield from data.splitlines()
+
+    def iter_tools(self, workers: int = 4) -> t.Iterator[dict]:
+        for line in self.iter_tool_bytes(workers):
+            yield json.loads(line)
+
+    def map_blocks(self, fn: t.Callable[[list], t.Any], workers: t.Optional[int] = None) -> list:
+        """
+        Apply fn (a picklable, module-level function) to the parsed tools of
+        every block across a process pool; results come back in block order.
+        """
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_map_block, self.path, offset, length, fn)
+                for offset, length, _ in self.blocks
+            ]
+            return [fut.result() for fut in futures]
+
+
+def _map_block(path: str, offset: int, length: int, fn):
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = _gunzip_block(f.read(length))
+    return fn([json.loads(line) for line in data.splitlines()])
+
+
+def merge_dumps(paths: list[str], dst: str) -> int:
+    """
+    Concatenate dumps (e.g. per-shard ones) without recompressing: gzip
+    members are copied and the indexes shifted. The first dump holding a
+    key wins. Returns the number of blocks written.
+    """
+    blocks: list[list[int]] = []
+    ids: dict[str, list[int]] = {}
+    _remove_index(dst)
+    with open(dst, "wb") as out:
+        for path in paths:
+            reader = DumpReader(path)
+            base = len(blocks)
+            with open(path, "rb") as f:
+                for offset, length, n in reader.blocks:
+                    f.seek(offset)
+                    blocks.append([out.tell(), length, n])
+                    out.write(f.read(length))
+            for key, (block, pos) in reader.ids.items():
+                ids.setdefault(key, [base + block, pos])
+    tmp = index_path(dst) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"format": DUMP_FORMAT, "blocks": blocks, "ids": ids}, f)
+    os.replace(tmp, index_path(dst))
+    return len(blocks)
+
+
+# --------- Legacy dumps ----------
+def iter_legacy_tool_bytes(path: str) -> t.Iterator[bytes]:
+    """Tools of an old backup.json (one JSON array), serialized compactly."""
+    with open(path, encoding="utf-8") as f:
+        tools = json.load(f)
+    for tool in tools:
+        yield json.dumps(tool).encode("utf-8")
+
+
+def convert(src: str, dst: str, block_tools: int = BLOCK_TOOLS) -> int:
+    """Rewrite a legacy JSON-array backup as a block-framed dump; returns tools written."""
+    n = 0
+    with DumpWriter(dst, block_tools) as w:
+        for tool_bytes in iter_legacy_tool_bytes(src):
+            tool = json.loads(tool_bytes)
+            w.write(tool_bytes, str(tool.get("biotoolsID", "")).strip())
+            n += 1
+    return n
+
+
+# --------- CLI ----------
+def main():
+    ap = argparse.ArgumentParser(description="Inspect and convert bio.tools registry dumps.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("convert", help="legacy backup.json -> block-framed .jsonl.gz")
+    p.add_argument("src")
+    p.add_argument("dst")
+    p.add_argument("--block-tools", type=int, default=BLOCK_TOOLS)
+
+    p = sub.add_parser("get", help="print tools by biotoolsID")
+    p.add_argument("dump")
+    p.add_argument("ids", nargs="+")
+
+    p = sub.add_parser("stats", help="blocks, tools and sizes of a dump")
+    p.add_argument("dump")
+    args = ap.parse_args()
+
+    if args.cmd == "convert":
+        n = convert(args.src, args.dst, args.block_tools)
+        print(
+            f"Wrote {n:,} tools to {args.dst} "
+            f"({os.path.getsize(args.src):,} -> {os.path.getsize(args.dst):,} bytes)"
+        )
+    elif args.cmd == "get":
+        reader = DumpReader(args.dump)
+        for biotools_id in args.ids:
+            raw = reader.get_bytes(biotools_id)
+            if raw is None:
+                sys.stderr.write(f"[WARN] {biotools_id}: not in {args.dump}\n")
+            else:
+                print(raw.decode("utf-8"))
+    elif args.cmd == "stats":
+        reader = DumpReader(args.dump)
+        print(
+            f"{args.dump}: {len(reader):,} tools, {len(reader.ids):,} indexed IDs, "
+            f"{len(reader.blocks):,} blocks, {os.path.getsize(args.dump):,} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+import os
+import json
+import time
+import threading
+import typing as t
+
+# --------- Defaults ----------
+CACHE_JSON = "repo_cache.json"
+MISSING_TTL_DAYS = 30  # re-check deleted/private repositories after this long
+MAX_RENAME_HOPS = 10
+
+
+def _key(owner: str, repo: str) -> str:
+    return f"{owner}/{repo}".lower()
+
+
+class RepoCache:
+    """
+    Persistent knowledge about repositories between harvest runs:
+
+    - missing:  404/451 answers, skipped until their TTL expires
+    - renamed:  old owner/repo -> canonical full_name (from redirects/GraphQL)
+    - archived: last seen archived flag
+
+    The file is loaded on first use. save() merges with whatever is on
+    disk, so shards sharing one cache file do not drop each other's entries.
+    """
+
+    def __init__(self, path: str = CACHE_JSON, missing_ttl_days: float = MISSING_TTL_DAYS):
+        self.path = path
+        self.missing_ttl = missing_ttl_days * 86400
+        self._lock = threading.Lock()
+        self._data: t.Optional[dict] = None
+        self._dirty: dict[str, dict] = {"missing": {}, "renamed": {}, "archived": {}}
+
+    def _load(self) -> dict:
+        if self._data is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                data = {}
+            self._data = {k: dict(data.get(k) or {}) for k in self._dirty}
+        return self._data
+
+    def _set(self, section: str, key: str, value):
+        self._load()[section][key] = value
+        self._dirty[section][key] = value
+
+    def _drop(self, section: str, key: str):
+        if self._load()[section].pop(key, None) is not None:
+            self._dirty[section][key] = None
+
+    # --- lookups ---
+    def canonical(self, owner: str, repo: str) -> tuple[str, str]:
+        """Follow recorded renames to the current owner/repo."""
+        with self._lock:
+            renamed = self._load()["renamed"]
+            for _ in range(MAX_RENAME_HOPS):
+                full_name = renamed.get(_key(owner, repo))
+                if not full_name:
+                    break
+                owner, repo = full_name.split("/", 1)
+            return owner, repo
+
+    def is_missing(self, owner: str, repo: str, now: t.Optional[float] = None) -> bool:
+        """True if the repository answered 404 within the TTL."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._load()["missing"].get(_key(owner, repo))
+            return bool(entry) and now - entry["checked_at"] < self.missing_ttl
+
+    def archived(self, owner: str, repo: str) -> t.Optional[bool]:
+        with self._lock:
+            return self._load()["archived"].get(_key(owner, repo))
+
+    # --- updates ---
+    def mark_missing(self, owner: str, repo: str, status: int):
+        with self._lock:
+            self._set("missing", _key(owner, repo), {"status": status, "checked_at": time.time()})
+
+    def mark_renamed(self, owner: str, repo: str, full_name: str):
+        if _key(owner, repo) == full_name.lower():
+            return
+        with self._lock:
+            self._set("renamed", _key(owner, repo), full_name)
+
+    def mark_found(self, owner: str, repo: str, archived: t.Optional[bool] = None):
+        with self._lock:
+            self._drop("missing", _key(owner, repo))
+            if archived is not None:
+                self._set("archived", _key(owner, repo), bool(archived))
+
+    # --- persistence ---
+    def save(self):
+        with self._lock:
+            if not any(self._dirty.values()):
+                return
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    on_disk = json.load(f)
+            except FileNotFoundError:
+                on_disk = {}
+            merged = {k: dict(on_disk.get(k) or {}) for k in self._dirty}
+            for section, entries in self._dirty.items():
+                for key, value in entries.items():
+                    if value is None:
+                        merged[section].pop(key, None)
+                    else:
+                        merged[section][key] = value
+
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(merged, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+            self._data = merged
+            self._dirty = {k: {} for k in self._dirty}
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+import os
+import re
+import csv
+import sys
+import gzip
+import hashlib
+import tempfile
+import typing as t
+from collections import Counter
+
+# --------- Input ----------
+MAP_CSV = "biotools_github_map.csv"  # expects: biotoolsID, github_urls
+PARTITIONS = 64  # spill files used by count_regions
+
+# --------- Key normalization ----------
+_BARE_RE = re.compile(r"^([\w.-]+)/([\w.-]+?)(?:\.git)?/?$")
+
+
+def repo_key(text: str, host: str = "github.com") -> t.Optional[str]:
+    """
+    Normalize a repository URL or a bare 'owner/repo' to a lowercase
+    'owner/repo' key (hosts compare names case-insensitively).
+    """
+    text = (text or "").strip().strip(" ,.;)")
+    m = re.search(rf"{re.escape(host)}[/:]([\w.-]+)/([\w.-]+)", text, re.IGNORECASE)
+    if not m:
+        m = _BARE_RE.match(text)
+    if not m:
+        return None
+    owner = m.group(1)
+    # URLs pasted into prose often end in sentence punctuation
+    repo = re.sub(r"\.git$", "", m.group(2).rstrip("."), flags=re.IGNORECASE)
+    if not owner or not repo:
+        return None
+    return f"{owner}/{repo}".lower()
+
+
+def key_hash(key: str) -> int:
+    """Stable 64-bit digest of a key (unlike hash(), identical across processes)."""
+    return int.from_bytes(
+        hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+# --------- Readers ----------
+def iter_listing(path: str) -> t.Iterator[str]:
+    """Yield non-empty lines of a (optionally gzipped) repository listing."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def iter_map_keys(path: str = MAP_CSV, host: str = "github.com"):
+    """
+    Yield (biotoolsID, key) for each tool in the map CSV, using the first
+    URL on `host` like fetch_GitHub_metrics does; key is None if there is none.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            key = None
+            for url in (row.get("github_urls") or "").split(";"):
+                if host in url.lower():
+                    key = repo_key(url, host)
+                    break
+            yield (row.get("biotoolsID") or "").strip(), key
+
+
+# --------- Index ----------
+class RepoIndex:
+    """
+    Hashed index of normalized 'owner/repo' keys for the small side of an
+    overlap (e.g. the registry). Lookups hash once and confirm the key, so
+    membership is exact even if two keys share a digest.
+    """
+
+    def __init__(self, keys: t.Iterable[str] = ()):
+        self._keys: dict[int, tuple[str, ...]] = {}
+        for k in keys:
+            self.add(k)
+
+    @classmethod
+    def from_map_csv(cls, path: str = MAP_CSV, host: str = "github.com"):
+        return cls(k for _, k in iter_map_keys(path, host) if k)
+
+    def add(self, key: str):
+        h = key_hash(key)
+        bucket = self._keys.get(h, ())
+        if key not in bucket:
+            self._keys[h] = bucket + (key,)
+
+    def lookup(self, key: str) -> t.Optional[int]:
+        """Return the digest of key if it is indexed, else None."""
+        h = key_hash(key)
+        return h if key in self._keys.get(h, ()) else None
+
+    def __contains__(self, key: str) -> bool:
+        return self.lookup(key) is not None
+
+    def __len__(self) -> int:
+        return sum(len(b) for b in self._keys.values())
+
+    def __iter__(self):
+        for bucket in self._keys.values():
+            yield from bucket
+
+
+def stream_overlap(index: RepoIndex, lines: t.Iterable[str], host="github.com"):
+    """
+    Stream a (large) listing against the index without holding it in memory.
+    Returns (parseable lines in the listing, set of indexed keys found in it);
+    duplicate lines are counted each time, count_regions gives distinct totals.
+    """
+    total = 0
+    hits: set[str] = set()
+    for line in lines:
+        key = repo_key(line, host)
+        if key is None:
+            continue
+        total += 1
+        if key in index:
+            hits.add(key)
+    return total, hits
+
+
+# --------- Exact multi-set regions ----------
+def count_regions(
+    sources: dict[str, t.Iterable[str]],
+    partitions: int = PARTITIONS,
+    host: str = "github.com",
+    tmpdir: t.Optional[str] = None,
+    on_key: t.Optional[t.Callable[[str, frozenset], None]] = None,
+) -> Counter:
+    """
+    Exact Venn region sizes for any number of repository listings.
+
+    Keys are spilled into `partitions` temporary files by digest, so at most
+    one partition is held in memory at a time. Returns a Counter mapping the
+    frozenset of source names that contain a key to the number of such keys.
+    on_key, if given, is called once per distinct key with its sources.
+    """
+    names = list(sources)
+    with tempfile.TemporaryDirectory(dir=tmpdir) as tmp:
+        spills = [
+            open(os.path.join(tmp, f"part-{p:04d}"), "w", encoding="utf-8")
+            for p in range(partitions)
+        ]
+        try:
+            for i, name in enumerate(names):
+                for line in sources[name]:
+                    key = repo_key(line, host)
+                    if key is not None:
+                        spills[key_hash(key) % partitions].write(f"{i}\t{key}\n")
+        finally:
+            for f in spills:
+                f.close()
+
+        regions: Counter = Counter()
+        for p in range(partitions):
+            masks: dict[str, int] = {}
+            with open(os.path.join(tmp, f"part-{p:04d}"), encoding="utf-8") as f:
+                for line in f:
+                    i, key = line.rstrip("\n").split("\t", 1)
+                    masks[key] = masks.get(key, 0) | (1 << int(i))
+            regions.update(Counter(masks.values()))
+            if on_key is not None:
+                for key, mask in masks.items():
+                    on_key(key, frozenset(n for i, n in enumerate(names) if mask >> i & 1))
+
+    return Counter(
+        {
+            frozenset(n for i, n in enumerate(names) if mask >> i & 1): count
+            for mask, count in regions.items()
+        }
+    )
+
+
+def open_source(path: str, host: str = "github.com") -> t.Iterable[str]:
+    """Keys of a map CSV (registry side) or lines of a plain/gzipped listing."""
+    if path.endswith(".csv"):
+        return (k for _, k in iter_map_keys(path, host) if k)
+    return iter_listing(path)
+
+
+# --------- Main ----------
+def main():
+    # usage: repo_overlap.py NAME=PATH [NAME=PATH ...]
+    specs = sys.argv[1:] or [f"bio.tools={MAP_CSV}"]
+    sources = {}
+    for spec in specs:
+        name, sep, path = spec.partition("=")
+        if not sep:
+            name, path = os.path.basename(spec), spec
+        sources[name] = open_source(path)
+
+    regions = count_regions(sources)
+    totals = Counter()
+    for members, count in regions.items():
+        for name in members:
+            totals[name] += count
+
+    for name in sources:
+        print(f"{name}: {totals[name]:,} distinct repositories")
+    for members, count in sorted(regions.items(), key=lambda kv: -kv[1]):
+        print(f"  only {' & '.join(sorted(members))}: {count:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+import os
+import csv
+import sys
+import sqlite3
+import argparse
+import typing as t
+from datetime import datetime, timezone
+
+from fetch_GitHub_metrics import METRIC_FIELDS, parse_owner_repo
+
+# --------- Defaults ----------
+DB_FILE = "biotools.db"
+BATCH_ROWS = 500  # rows per upsert transaction in the stages
+
+# export views and the CSV each one replaces
+EXPORTS = {
+    "biotools_github_map": "biotools_github_map.csv",
+    "biotools_with_metrics": "biotools_with_metrics.csv",
+    "biotools_with_metrics_and_maturity": "biotools_with_metrics_and_maturity.csv",
+    "github_candidates_with_metrics": "github_candidates_with_metrics.csv",
+}
+
+
+def _q(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+_METRIC_COLS = ",\n  ".join(
+    f"{_q(c)} {'REAL' if c == 'avg_time_to_close_days' else 'INTEGER'}"
+    for c in METRIC_FIELDS
+)
+# a snapshot counts only if one of these is set: failed or skipped harvests leave all None
+_COUNT_FIELDS = [c for c in METRIC_FIELDS if c != "repo.archived"]
+_HAS_COUNTS = " OR ".join(f"x.{_q(c)} IS NOT NULL" for c in _COUNT_FIELDS)
+
+# rows for one repository in one snapshot (tools sharing it) merge field by
+# field: a later row fills gaps but never blanks a known value
+_MERGE_METRICS = ", ".join(f"{_q(c)} = coalesce(excluded.{_q(c)}, {_q(c)})" for c in METRIC_FIELDS)
+
+# archived is stored 0/1 and exported as the True/False the CSVs always had.
+# The export views join repositories as r: a repository now missing (404, or
+# skipped by the negative cache) exports blank metrics and its last known
+# archived flag, as the stage CSVs do, rather than its last good snapshot.
+_METRIC_SELECT = ", ".join(
+    f"CASE coalesce(m.{_q(c)}, r.archived) WHEN 1 THEN 'True' WHEN 0 THEN 'False' END AS {_q(c)}"
+    if c == "repo.archived"
+    else f"m.{_q(c)}"
+    for c in METRIC_FIELDS
+)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS tools (
+  biotoolsID TEXT PRIMARY KEY,
+  name TEXT,
+  updated_at TEXT NOT NULL
+);
+
+-- GitHub URLs of a tool, in registry order; owner/repo parsed where possible
+CREATE TABLE IF NOT EXISTS repo_links (
+  biotoolsID TEXT NOT NULL REFERENCES tools(biotoolsID) ON DELETE CASCADE,
+  position INTEGER NOT NULL,
+  url TEXT NOT NULL,
+  owner TEXT COLLATE NOCASE,
+  repo TEXT COLLATE NOCASE,
+  PRIMARY KEY (biotoolsID, position)
+);
+CREATE INDEX IF NOT EXISTS repo_links_owner_repo ON repo_links(owner, repo);
+
+CREATE TABLE IF NOT EXISTS repositories (
+  owner TEXT NOT NULL COLLATE NOCASE,
+  repo TEXT NOT NULL COLLATE NOCASE,
+  canonical TEXT,  -- owner/repo after renames
+  archived INTEGER,
+  missing INTEGER NOT NULL DEFAULT 0,
+  updated_at TEXT NOT NULL,
+  PRIMARY KEY (owner, repo)
+);
+
+-- one row per repository, source (api, gharchive, ...) and harvest run
+CREATE TABLE IF NOT EXISTS metric_snapshots (
+  owner TEXT NOT NULL COLLATE NOCASE,
+  repo TEXT NOT NULL COLLATE NOCASE,
+  source TEXT NOT NULL,
+  taken_at TEXT NOT NULL,
+  {_METRIC_COLS},
+  PRIMARY KEY (owner, repo, source, taken_at)
+);
+
+-- repositories found by discover_repositories.py that bio.tools did not list
+CREATE TABLE IF NOT EXISTS candidates (
+  owner TEXT NOT NULL COLLATE NOCASE,
+  repo TEXT NOT NULL COLLATE NOCASE,
+  url TEXT NOT NULL,
+  created_at TEXT,
+  stargazers_count INTEGER,  -- as reported by the search
+  topics TEXT,
+  query TEXT,
+  found_at TEXT NOT NULL,
+  PRIMARY KEY (owner, repo)
+);
+
+CREATE TABLE IF NOT EXISTS maturity (
+  biotoolsID TEXT PRIMARY KEY,
+  maturity TEXT,
+  updated_at TEXT NOT NULL
+);
+
+-- views are recreated on connect, so stores created by older versions pick up changes
+DROP VIEW IF EXISTS latest_metrics;
+CREATE VIEW latest_metrics AS
+SELECT s.* FROM metric_snapshots s
+WHERE s.taken_at = (
+  SELECT max(x.taken_at) FROM metric_snapshots x
+  WHERE x.owner = s.owner AND x.repo = s.repo AND x.source = s.source
+    AND ({_HAS_COUNTS})
+);
+
+-- tool -> first GitHub URL, the link every stage harvests (cf. row_target)
+DROP VIEW IF EXISTS tool_targets;
+CREATE VIEW tool_targets AS
+SELECT t.rowid AS tool_order, t.biotoolsID, l.owner, l.repo, trim(l.url) AS repo_url
+FROM tools t
+LEFT JOIN repo_links l ON l.biotoolsID = t.biotoolsID AND l.position = (
+  SELECT min(position) FROM repo_links
+  WHERE biotoolsID = t.biotoolsID AND url LIKE '%github.com%'
+);
+
+DROP VIEW IF EXISTS biotools_github_map;
+CREATE VIEW biotools_github_map AS
+SELECT t.biotoolsID, coalesce((
+  SELECT group_concat(url, ';') FROM (
+    SELECT url FROM repo_links WHERE biotoolsID = t.biotoolsID ORDER BY position
+  )), '') AS github_urls
+FROM tools t ORDER BY t.rowid;
+
+DROP VIEW IF EXISTS biotools_with_metrics;
+CREATE VIEW biotools_with_metrics AS
+SELECT g.biotoolsID, g.owner, g.repo, g.repo_url, {_METRIC_SELECT}
+FROM tool_targets g
+LEFT JOIN repositories r ON r.owner = g.owner AND r.repo = g.repo
+LEFT JOIN latest_metrics m
+  ON m.owner = g.owner AND m.repo = g.repo AND m.source = 'api' AND NOT coalesce(r.missing, 0)
+ORDER BY g.tool_order;
+
+DROP VIEW IF EXISTS biotools_with_metrics_and_maturity;
+CREATE VIEW biotools_with_metrics_and_maturity AS
+SELECT g.biotoolsID, g.owner, g.repo, g.repo_url, {_METRIC_SELECT}, mt.maturity
+FROM tool_targets g
+LEFT JOIN repositories r ON r.owner = g.owner AND r.repo = g.repo
+LEFT JOIN latest_metrics m
+  ON m.owner = g.owner AND m.repo = g.repo AND m.source = 'api' AND NOT coalesce(r.missing, 0)
+LEFT JOIN maturity mt ON mt.biotoolsID = g.biotoolsID
+ORDER BY g.tool_order;
+
+-- candidates with their harvested metrics, minus any registered since they were found
+DROP VIEW IF EXISTS github_candidates_with_metrics;
+CREATE VIEW github_candidates_with_metrics AS
+SELECT c.owner, c.repo, c.url AS repo_url, c.created_at, c.topics, c.query, {_METRIC_SELECT}
+FROM candidates c
+LEFT JOIN repositories r ON r.owner = c.owner AND r.repo = c.repo
+LEFT JOIN latest_metrics m
+  ON m.owner = c.owner AND m.repo = c.repo AND m.source = 'api' AND NOT coalesce(r.missing, 0)
+WHERE NOT EXISTS (
+  SELECT 1 FROM repo_links l WHERE l.owner = c.owner AND l.repo = c.repo
+)
+ORDER BY c.rowid;
+"""
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def connect(path: str = DB_FILE) -> sqlite3.Connection:
+    """
+    Open (and create) the store. WAL lets readers and exports run while a
+    harvest is writing; busy_timeout lets shards share one database.
+    """
+    conn = sqlite3.connect(path, timeout=60)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def batched(rows: t.Iterable, size: int = BATCH_ROWS) -> t.Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _value(v):
+    """CSV text -> int/float/None; native values pass through."""
+    if not isinstance(v, str):
+        return v
+    v = v.strip()
+    if v in ("", "None", "nan"):
+        return None
+    if v in ("True", "False"):
+        return v == "True"
+    try:
+        return int(v)
+    except ValueError:
+        return float(v)
+
+
+# --------- Upserts (one transaction per call) ----------
+def upsert_tools(conn: sqlite3.Connection, rows: t.Iterable[dict]):
+    """rows: {"biotoolsID", "name", "github_urls": [url, ...] or "a;b"}; links are replaced."""
+    stamp = now_iso()
+    tools, links, ids = [], [], []
+    for row in rows:
+        biotools_id = (row.get("biotoolsID") or "").strip()
+        if not biotools_id:
+            continue
+        urls = row.get("github_urls") or []
+        if isinstance(urls, str):
+            urls = [u for u in urls.split(";") if u.strip()]
+        tools.append((biotools_id, row.get("name"), stamp))
+        ids.append((biotools_id,))
+        for position, url in enumerate(urls):
+            parsed = parse_owner_repo(url.strip()) or (None, None)
+            links.append((biotools_id, position, url, *parsed))
+    with conn:
+        conn.executemany(
+            "INSERT INTO tools (biotoolsID, name, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(biotoolsID) DO UPDATE SET "
+            "name = coalesce(excluded.name, name), updated_at = excluded.updated_at",
+            tools,
+        )
+        conn.executemany("DELETE FROM repo_links WHERE biotoolsID = ?", ids)
+        conn.executemany(
+            "INSERT OR REPLACE INTO repo_links (biotoolsID, position, url, owner, repo) "
+            "VALUES (?, ?, ?, ?, ?)",
+            links,
+        )
+
+
+def upsert_metrics(
+    conn: sqlite3.Connection, rows: t.Iterable[dict], source: str, taken_at: str
+):
+    """
+    One snapshot per row with an owner/repo and at least one metric (rows as
+    in biotools_with_metrics.csv). Rows without any, from failed or skipped
+    harvests, would otherwise hide the last good snapshot; their missing
+    state goes to upsert_repositories instead.
+    """
+    cols = ["owner", "repo", "source", "taken_at", *METRIC_FIELDS]
+    values = []
+    for row in rows:
+        if not (row.get("owner") and row.get("repo")):
+            continue
+        metrics = {c: _value(row.get(c)) for c in METRIC_FIELDS}
+        if all(metrics[c] is None for c in _COUNT_FIELDS):
+            continue
+        values.append((row["owner"], row["repo"], source, taken_at, *metrics.values()))
+    with conn:
+        conn.executemany(
+            f"INSERT INTO metric_snapshots ({', '.join(map(_q, cols))}) "
+            f"VALUES ({', '.join('?' * len(cols))}) "
+            f"ON CONFLICT(owner, repo, source, taken_at) DO UPDATE SET {_MERGE_METRICS}",
+            values,
+        )
+
+
+def upsert_repositories(conn: sqlite3.Connection, rows: t.Iterable[dict]):
+    """rows: {"owner", "repo", "canonical", "archived", "missing"}."""
+    stamp = now_iso()
+    values = [
+        (
+            row["owner"],
+            row["repo"],
+            row.get("canonical"),
+            _value(row.get("archived")),
+            int(bool(row.get("missing"))),
+            stamp,
+        )
+        for row in rows
+    ]
+    with conn:
+        conn.executemany(
+            "INSERT INTO repositories (owner, repo, canonical, archived, missing, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(owner, repo) DO UPDATE SET canonical = excluded.canonical, "
+            "archived = coalesce(excluded.archived, archived), "
+            "missing = excluded.missing, updated_at = excluded.updated_at",
+            values,
+        )
+
+
+def upsert_candidates(conn: sqlite3.Connection, rows: t.Iterable[dict]):
+    """rows as in github_candidates.csv ("full_name", "github_urls", ...)."""
+    stamp = now_iso()
+    values = []
+    for row in rows:
+        owner, _, repo = (row.get("full_name") or "").partition("/")
+        if not owner or not repo:
+            continue
+        values.append(
+            (
+                owner,
+                repo,
+                row.get("github_urls") or f"https://github.com/{owner}/{repo}",
+                row.get("created_at"),
+                _value(row.get("stargazers_count")),
+                row.get("topics"),
+                row.get("query"),
+                stamp,
+            )
+        )
+    with conn:
+        conn.executemany(
+            "INSERT INTO candidates "
+            "(owner, repo, url, created_at, stargazers_count, topics, query, found_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(owner, repo) DO UPDATE SET url = excluded.url, "
+            "stargazers_count = excluded.stargazers_count, topics = excluded.topics",
+            values,
+        )
+
+
+def upsert_maturity(conn: sqlite3.Connection, rows: t.Iterable[tuple[str, str]]):
+    """rows: (biotoolsID, maturity)."""
+    stamp = now_iso()
+    with conn:
+        conn.executemany(
+            "INSERT INTO maturity (biotoolsID, maturity, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(biotoolsID) DO UPDATE SET "
+            "maturity = excluded.maturity, updated_at = excluded.updated_at",
+            [(biotools_id, maturity, stamp) for biotools_id, maturity in rows],
+        )
+
+
+# --------- Reads and exports ----------
+def iter_view(conn: sqlite3.Connection, view: str) -> t.Iterator[dict]:
+    cur = conn.execute(f"SELECT * FROM {_q(view)}")
+    names = [d[0] for d in cur.description]
+    for values in cur:
+        yield dict(zip(names, values))
+
+
+def iter_map_rows(conn: sqlite3.Connection) -> t.Iterator[dict]:
+    """Rows shaped like biotools_github_map.csv, in registry order."""
+    return iter_view(conn, "biotools_github_map")
+
+
+def tools_without_maturity(conn: sqlite3.Connection) -> list[str]:
+    return [
+        r[0]
+        for r in conn.execute(
+            "SELECT t.biotoolsID FROM tools t "
+            "LEFT JOIN maturity m ON m.biotoolsID = t.biotoolsID "
+            "WHERE m.biotoolsID IS NULL ORDER BY t.rowid"
+        )
+    ]
+
+
+def export_view(conn: sqlite3.Connection, view: str, path: str) -> int:
+    """Write a view as CSV (NULL -> empty field); returns the number of rows."""
+    cur = conn.execute(f"SELECT * FROM {_q(view)}")
+    n = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, lineterminator="\n")
+        w.writerow([d[0] for d in cur.description])
+        for n, values in enumerate(cur, 1):
+            w.writerow(values)
+    return n
+
+
+# --------- Import of existing CSVs ----------
+def load_csvs(
+    conn: sqlite3.Connection,
+    map_csv: t.Optional[str] = None,
+    metrics_csv: t.Optional[str] = None,
+    maturity_csv: t.Optional[str] = None,
+    taken_at: t.Optional[str] = None,
+) -> dict:
+    """Seed the store from the CSV hand-offs of an earlier run."""
+    counts = {}
+    if map_csv:
+        with open(map_csv, newline="", encoding="utf-8") as f:
+            counts["tools"] = 0
+            for batch in batched(csv.DictReader(f)):
+                upsert_tools(conn, batch)
+                counts["tools"] += len(batch)
+    for path, kind in ((metrics_csv, "metrics"), (maturity_csv, "maturity")):
+        if not path:
+            continue
+        stamp = taken_at or datetime.fromtimestamp(
+            os.path.getmtime(path), timezone.utc
+        ).isoformat(timespec="seconds")
+        counts[kind] = 0
+        with open(path, newline="", encoding="utf-8") as f:
+            for batch in batched(csv.DictReader(f)):
+                upsert_metrics(conn, batch, "api", stamp)
+                if kind == "maturity":
+                    upsert_maturity(
+                        conn, [(r["biotoolsID"], r.get("maturity")) for r in batch]
+                    )
+                counts[kind] += len(batch)
+    return counts
+
+
+# --------- CLI ----------
+def main():
+    ap = argparse.ArgumentParser(description="SQLite store shared by the pipeline stages.")
+    ap.add_argument("--db", default=DB_FILE)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("export", help="write views as the pipeline's CSV files")
+    p.add_argument("views", nargs="*", help=f"default: {', '.join(EXPORTS)}")
+    p.add_argument("--dir", default=".", help="output directory")
+
+    p = sub.add_parser("load-csv", help="seed the store from existing CSV files")
+    p.add_argument("--map-csv")
+    p.add_argument("--metrics-csv")
+    p.add_argument("--maturity-csv", help="metrics + maturity CSV (also loads metrics)")
+    p.add_argument("--taken-at", help="snapshot time (default: file mtime)")
+
+    sub.add_parser("stats", help="row counts per table")
+    args = ap.parse_args()
+
+    conn = connect(args.db)
+    if args.cmd == "export":
+        os.makedirs(args.dir, exist_ok=True)
+        for view in args.views or EXPORTS:
+            if view not in EXPORTS:
+                sys.stderr.write(f"ERROR: unknown view {view!r}\n")
+                sys.exit(1)
+            path = os.path.join(args.dir, EXPORTS[view])
+            print(f"{view}: {export_view(conn, view, path):,} rows -> {path}")
+    elif args.cmd == "load-csv":
+        counts = load_csvs(
+            conn, args.map_csv, args.metrics_csv, args.maturity_csv, args.taken_at
+        )
+        for kind, n in counts.items():
+            print(f"Loaded {n:,} {kind} rows into {args.db}")
+    elif args.cmd == "stats":
+        for table in (
+            "tools",
+            "repo_links",
+            "repositories",
+            "metric_snapshots",
+            "maturity",
+            "candidates",
+        ):
+            n = conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+            print(f"{table:<17} {n:>10,}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
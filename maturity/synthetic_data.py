@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+import csv
+import json
+import random
+import string
+import typing as t
+from datetime import datetime, timedelta, timezone
+
+# Size of the registry the "1×" scale stands for (bio.tools, November 2025)
+REGISTRY_SIZE = 30_608
+GITHUB_FRACTION = 0.45  # share of entries with at least one GitHub URL
+VALID_FRACTION = 0.97  # share of those that resolve to a public repository
+
+MATURITY_WEIGHTS = {"None": 26_345, "Mature": 3_532, "Emerging": 611, "Legacy": 120}
+
+METRIC_COLS = [
+    "repo.stargazers_count",
+    "repo.watchers_count",
+    "repo.subscribers_count",
+    "repo.forks_count",
+    "repo.open_issues_count",
+    "repo.network_count",
+    "num_contributors",
+    "num_releases",
+    "num_commits",
+    "num_pulls",
+    "avg_time_to_close_days",
+]
+
+_EPOCH = datetime(2010, 1, 1, tzinfo=timezone.utc)
+
+GITHUB_LAUNCH = datetime(2008, 2, 8, tzinfo=timezone.utc)
+SEARCH_TOPICS = ["bioinformatics", "genomics", "computational-biology", "proteomics"]
+OTHER_TOPICS = ["python", "r", "machine-learning", "pipeline", "visualization", "docker"]
+LICENSES = ["MIT", "GPL-3.0", "Apache-2.0", "BSD-3-Clause", "GPL-2.0", "NOASSERTION", None]
+LANGUAGES = ["Python", "R", "C++", "C", "Java", "Shell", "Perl", "Nextflow", "JavaScript"]
+README_NAMES = ["README.md", "README.md", "README.md", "README.rst", "README", None]
+
+
+# -----------------------------
+# Names and URLs
+# -----------------------------
+def _word(rng: random.Random, lo: int = 3, hi: int = 10) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(lo, hi)))
+
+
+def make_owner_repo(rng: random.Random) -> tuple[str, str]:
+    owner = rng.choice([_word(rng), _word(rng).capitalize() + "Lab", _word(rng) + "-group"])
+    repo = rng.choice([_word(rng), _word(rng) + "-" + _word(rng), _word(rng).upper()])
+    return owner, repo
+
+
+def make_github_url(rng: random.Random, owner: str, repo: str) -> str:
+    """A GitHub URL in one of the shapes found in registry records."""
+    return rng.choice(
+        [
+            f"https://github.com/{owner}/{repo}",
+            f"https://github.com/{owner}/{repo}/",
+            f"https://github.com/{owner}/{repo}.git",
+            f"http://www.github.com/{owner}/{repo}",
+            f"https://github.com/{owner}/{repo}/tree/master",
+            f"https://github.com/{owner}/{repo}/releases",
+            f"https://github.com/{owner}/{repo}#readme",
+            f"https://github.com/{owner}/{repo}).",
+        ]
+    )
+
+
+# -----------------------------
+# bio.tools records
+# -----------------------------
+def make_tool(rng: random.Random, i: int) -> dict:
+    """One bio.tools-shaped record; GitHub URLs appear where the registry puts them."""
+    biotools_id = f"{_word(rng, 4, 12)}_{i}"
+    tool = {
+        "biotoolsID": biotools_id,
+        "name": biotools_id,
+        "description": " ".join(_word(rng) for _ in range(rng.randint(10, 60))),
+        "homepage": f"https://{_word(rng)}.org/{biotools_id}",
+        "toolType": [rng.choice(["Command-line tool", "Web application", "Library"])],
+        "topic": [
+            {"uri": f"http://edamontology.org/topic_{rng.randint(0, 4000):04d}"}
+            for _ in range(rng.randint(1, 4))
+        ],
+        "function": [
+            {
+                "operation": [
+                    {"uri": f"http://edamontology.org/operation_{rng.randint(0, 4000):04d}"}
+                ],
+                "input": [],
+                "output": [],
+            }
+        ],
+        "link": [
+            {"url": f"https://{_word(rng)}.org/docs", "type": ["Other"]}
+            for _ in range(rng.randint(0, 3))
+        ],
+        "download": [],
+        "publication": [
+            {"doi": f"10.{rng.randint(1000, 9999)}/{_word(rng)}.{rng.randint(1, 99999)}"}
+        ],
+        "maturity": rng.choices(
+            [None if m == "None" else m for m in MATURITY_WEIGHTS],
+            weights=list(MATURITY_WEIGHTS.values()),
+        )[0],
+    }
+
+    if rng.random() < GITHUB_FRACTION:
+        url = make_github_url(rng, *make_owner_repo(rng))
+        where = rng.choices(
+            ["link", "homepage", "download", "description"], weights=[60, 25, 10, 5]
+        )[0]
+        if where == "link":
+            tool["link"].append({"url": url, "type": ["Repository"]})
+        elif where == "homepage":
+            tool["homepage"] = url
+        elif where == "download":
+            tool["download"].append({"url": url, "type": "Source code"})
+        else:
+            # only reachable through the scan-all-strings fallback
+            tool["description"] += f" Source: {url}"
+    return tool
+
+
+def iter_tools(scale: float = 1, seed: int = 0) -> t.Iterator[dict]:
+    rng = random.Random(seed)
+    for i in range(int(REGISTRY_SIZE * scale)):
+        yield make_tool(rng, i)
+
+
+def iter_tool_bytes(scale: float = 1, seed: int = 0) -> t.Iterator[bytes]:
+    """Tools serialized the way BiotoolsIterator yields them."""
+    for tool in iter_tools(scale, seed):
+        yield json.dumps(tool).encode("utf-8")
+
+
+def make_api_page(tools: list[dict], page: int, last_page: int) -> dict:
+    """A /api/tool/ page in the shape BiotoolsIterator consumes."""
+    return {
+        "count": len(tools),
+        "next": f"?page={page + 1}" if page < last_page else None,
+        "previous": f"?page={page - 1}" if page > 1 else None,
+        "list": tools,
+    }
+
+
+# -----------------------------
+# Issues and metrics
+# -----------------------------
+def make_issue_nodes(rng: random.Random, n: int = 100) -> list[dict]:
+    """GraphQL issuesClosed nodes with log-normal lifetimes, plus some junk."""
+    nodes = []
+    for _ in range(n):
+        created = _EPOCH + timedelta(seconds=rng.randint(0, 15 * 365 * 86400))
+        closed = created + timedelta(days=rng.lognormvariate(1.5, 2.0))
+        r = rng.random()
+        if r < 0.02:
+            nodes.append({"createdAt": created.isoformat(), "closedAt": None})
+        elif r < 0.03:
+            nodes.append({"createdAt": "not-a-date", "closedAt": "x"})
+        else:
+            nodes.append(
+                {
+                    "createdAt": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "closedAt": closed.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                }
+            )
+    return nodes
+
+
+def make_metrics(rng: random.Random) -> dict:
+    """Heavy-tailed, mutually correlated repository metrics."""
+    activity = rng.lognormvariate(0, 1.5)
+    stars = int(rng.lognormvariate(1.5, 2.0) * activity)
+    forks = int(stars * rng.uniform(0.05, 0.5))
+    return {
+        "repo.stargazers_count": stars,
+        "repo.watchers_count": stars,
+        "repo.subscribers_count": int(rng.lognormvariate(0.8, 1.0) * activity),
+        "repo.forks_count": forks,
+        "repo.open_issues_count": int(rng.lognormvariate(0.5, 1.5) * activity),
+        "repo.network_count": forks,
+        "num_contributors": max(1, int(rng.lognormvariate(0.7, 1.0) * activity)),
+        "num_releases": int(rng.lognormvariate(0.3, 1.5) * activity),
+        "num_commits": max(1, int(rng.lognormvariate(4.5, 1.5) * activity)),
+        "num_pulls": int(rng.lognormvariate(1.0, 1.8) * activity),
+        "avg_time_to_close_days": round(rng.lognormvariate(2.0, 1.5), 3),
+    }
+
+
+def make_repo_profile(rng: random.Random, bio: bool = True) -> dict:
+    """Search-visible fields of a repository: creation time, topics, description."""
+    # creation times skew towards recent years, like GitHub's growth
+    span = (datetime(2025, 11, 1, tzinfo=timezone.utc) - GITHUB_LAUNCH).total_seconds()
+    created = GITHUB_LAUNCH + timedelta(seconds=span * rng.random() ** 0.5)
+    topics = rng.sample(OTHER_TOPICS, rng.randint(0, 2))
+    if bio:
+        topics += rng.sample(SEARCH_TOPICS, rng.randint(0, 2))
+    words = [_word(rng) for _ in range(rng.randint(3, 12))]
+    if bio and rng.random() < 0.5:
+        words.insert(rng.randint(0, len(words)), "bioinformatics")
+    return {
+        "created_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "topics": sorted(set(topics)),
+        "description": " ".join(words),
+    }
+
+
+def make_repo_metadata(rng: random.Random, full_name: str) -> dict:
+    """License, language sizes and files (README, CITATION.cff) of a repository."""
+    name = full_name.split("/")[-1]
+    files = {}
+    readme = rng.choice(README_NAMES)
+    if readme:
+        paragraphs = [
+            " ".join(_word(rng) for _ in range(rng.randint(20, 80)))
+            for _ in range(rng.randint(1, 6))
+        ]
+        files[readme] = f"# {name}\n\n" + "\n\n".join(paragraphs) + "\n"
+    if rng.random() < 0.2:
+        files["CITATION.cff"] = (
+            "cff-version: 1.2.0\n"
+            "message: If you use this software, please cite it as below.\n"
+            f"title: {name}\n"
+            "authors:\n"
+            f"  - family-names: {_word(rng).capitalize()}\n"
+            f"    given-names: {_word(rng).capitalize()}\n"
+        )
+    languages = rng.sample(LANGUAGES, rng.randint(1, 4))
+    return {
+        "license": rng.choice(LICENSES),
+        "languages": {lang: int(rng.lognormvariate(10, 2)) for lang in languages},
+        "files": files,
+    }
+
+
+def iter_metrics_rows(scale: float = 1, seed: int = 0) -> t.Iterator[dict]:
+    """Rows of biotools_with_metrics_and_maturity.csv."""
+    rng = random.Random(seed)
+    maturities = list(MATURITY_WEIGHTS)
+    weights = list(MATURITY_WEIGHTS.values())
+    for i in range(int(REGISTRY_SIZE * scale)):
+        row = {"biotoolsID": f"tool_{i}"}
+        if rng.random() < GITHUB_FRACTION:
+            owner, repo = make_owner_repo(rng)
+            row.update(
+                owner=owner, repo=repo, repo_url=f"https://github.com/{owner}/{repo}"
+            )
+            if rng.random() < VALID_FRACTION:
+                row.update(make_metrics(rng))
+        row["maturity"] = rng.choices(maturities, weights=weights)[0]
+        yield row
+
+
+def write_metrics_csv(path: str, scale: float = 1, seed: int = 0) -> int:
+    fields = ["biotoolsID", "owner", "repo", "repo_url", *METRIC_COLS, "maturity"]
+    n = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=fields)
+        w.writeheader()
+        for row in iter_metrics_rows(scale, seed):
+            w.writerow(row)
+            n += 1
+    return n
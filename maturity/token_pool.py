@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+import os
+import re
+import time
+import threading
+import typing as t
+from collections import Counter
+
+import requests
+
+# --------- Defaults ----------
+DEFAULT_LIMITS = {"core": 5000, "graphql": 5000, "search": 30}  # until headers say otherwise
+USER_AGENT = "bio.tools-metrics-script"
+
+
+class TokenState:
+    """One credential: its own connection pool and per-resource budgets."""
+
+    def __init__(self, token: str):
+        self.token = token
+        self.label = "…" + token[-4:] if len(token) > 8 else "token"
+        self.session = requests.Session()
+        self.session.headers.update(
+            {
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json",
+                "User-Agent": USER_AGENT,
+            }
+        )
+        self.remaining: dict[str, int] = {}
+        self.reset_at: dict[str, float] = {}
+        self.parked_until: dict[str, float] = {}
+        self.in_flight: Counter = Counter()
+        self.used: Counter = Counter()  # successful (non rate-limited) requests
+
+    def budget(self, resource: str, now: float) -> int:
+        left = self.remaining.get(resource)
+        if left is None or self.reset_at.get(resource, now + 1) <= now:
+            left = DEFAULT_LIMITS.get(resource, 5000)  # unknown or window has reset
+        return left - self.in_flight[resource]
+
+    def ready_at(self, resource: str, now: float) -> float:
+        """When this token can next be used for resource."""
+        when = self.parked_until.get(resource, 0)
+        if self.budget(resource, now) <= 0:
+            when = max(when, self.reset_at.get(resource, now + 1))
+        return when
+
+
+class TokenPool:
+    """
+    Spread GitHub requests over several tokens. Each request goes to the
+    token with the most budget left for its resource (REST "core",
+    "graphql", "search" are tracked separately); tokens that hit a limit
+    are parked until their reset time.
+    """
+
+    def __init__(self, tokens: t.Iterable[str]):
+        self.tokens = [TokenState(tok) for tok in dict.fromkeys(tokens) if tok]
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_env(cls) -> "TokenPool":
+        """Tokens from GITHUB_TOKENS (comma/space separated), else GITHUB_TOKEN."""
+        raw = os.environ.get("GITHUB_TOKENS") or os.environ.get("GITHUB_TOKEN") or ""
+        return cls(re.split(r"[\s,]+", raw.strip()))
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    # --- scheduling ---
+    def acquire(self, resource: str) -> TokenState:
+        if not self.tokens:
+            raise RuntimeError("No GitHub tokens configured.")
+        with self._cond:
+            while True:
+                now = time.time()
+                ready = [s for s in self.tokens if s.ready_at(resource, now) <= now]
+                if ready:
+                    best = max(ready, key=lambda s: s.budget(resource, now))
+                    best.in_flight[resource] += 1
+                    return best
+                wake = min(s.ready_at(resource, now) for s in self.tokens)
+                self._cond.wait(timeout=max(0.1, wake - now))
+
+    def release(self, state: TokenState, resource: str, response=None) -> bool:
+        """Record the response's budget headers; return True if it was rate limited."""
+        limited = False
+        with self._cond:
+            state.in_flight[resource] -= 1
+            if response is not None:
+                h = response.headers
+                resource = h.get("X-RateLimit-Resource", resource)
+                if "X-RateLimit-Remaining" in h:
+                    state.remaining[resource] = int(h["X-RateLimit-Remaining"])
+                if "X-RateLimit-Reset" in h:
+                    state.reset_at[resource] = float(h["X-RateLimit-Reset"])
+
+                if response.status_code in (403, 429):
+                    if "Retry-After" in h:  # secondary limit
+                        limited = True
+                        state.parked_until[resource] = time.time() + float(h["Retry-After"])
+                    elif state.remaining.get(resource) == 0:  # primary limit
+                        limited = True
+                        state.parked_until[resource] = state.reset_at.get(
+                            resource, time.time() + 60
+                        )
+                if not limited:
+                    state.used[resource] += 1
+            self._cond.notify_all()
+        return limited
+
+    def request(self, method: str, url: str, resource: str = "core", **kwargs):
+        """Send a request with the best token, retrying on another one if rate limited."""
+        while True:
+            state = self.acquire(resource)
+            try:
+                r = state.session.request(method, url, **kwargs)
+            except Exception:
+                self.release(state, resource)
+                raise
+            if not self.release(state, resource, r):
+                return r
+
+    # --- reporting ---
+    def report(self) -> list[dict]:
+        """Requests served and budget left, per token."""
+        with self._cond:
+            return [
+                {
+                    "token": s.label,
+                    "requests": dict(s.used),
+                    "remaining": dict(s.remaining),
+                }
+                for s in self.tokens
+            ]